@@ -66,6 +66,7 @@ class GraphConfig:
     stage_dir: Path = field(default_factory=lambda: Path(".nexus"))
     graph_index_path: Path = None # set in __post_init__
     graph_meta_path: Path = None # set in __post_init__
+    response_cache_path: Path = None # set in __post_init__
 
     max_tokens: int = 2056 # | TODO
 
@@ -93,11 +94,15 @@ class GraphConfig:
     ])
     
     system_prompt: str = "You are a helpful extraction assistant." # | TODO
+    prompt_cache_control: Optional[dict] = None # e.g. {"type": "ephemeral"} for Anthropic-compatible backends
+    warm_prompt_cache: bool = False # run the first async extraction alone so the rest hit the cached prefix (only pays off with provider prompt caching)
+    stream_extraction: bool = False # async only: stream responses and queue records as they arrive
 
     extraction_concurrency: Literal["sync", "async"] = "async"
     extraction_llm_backend: Literal["openai", "openrouter", "local"] = "openai"
 
     extraction_batch_size: int = 10
+    response_cache: bool = False # reuse stored LLM responses for identical requests (replays them on rebuild)
 
     def _load_extraction_templates(self):
         for domain in self.extraction_domains:
@@ -121,6 +126,8 @@ class GraphConfig:
             self.graph_index_path = self.stage_dir / "graph.sqlite"
         if self.graph_meta_path is None:
              self.graph_meta_path = self.stage_dir / "meta_graph.sqlite"
+        if self.response_cache_path is None:
+            self.response_cache_path = self.stage_dir / "llm_cache.sqlite"
         self._load_extraction_templates()
 
 
@@ -129,6 +136,8 @@ class LLMConfig:
     sync_model: Optional[str] = "gpt-5-mini" # "qwen/qwen3-30b-a3b-2507"
     async_model: Optional[str] = "gpt-5-mini"
     semaphore_rate: Optional[int] = 1
+    max_semaphore_rate: Optional[int] = None # set to let async concurrency adapt (AIMD) between semaphore_rate and this
+    retries: int = 0 # retries per LLM call (exponential backoff)
     local_backend_url: Optional[str] = "http://localhost:1234/v1"
 
     price_million_input_tokens: Optional[float] = None # USD
@@ -3,6 +3,7 @@ from .doc import DocLike, Doc
 from .process import ProcessingStats
 from .claim import ClaimData
 from .relationship import RelationshipRecord
+from .edge import EdgeRecord
 from .error import (
     RelationshipCollisionError,
     AliasConflictError,
@@ -19,6 +20,7 @@ __all__ = [
     "ProcessingStats",
     "ClaimData",
     "RelationshipRecord",
+    "EdgeRecord",
     "RelationshipCollisionError",
     "AliasConflictError",
     "EntityNotFoundError",
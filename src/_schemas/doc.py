@@ -12,11 +12,19 @@ class DocLike(Protocol):
     context: Optional[str]
 
 
-@dataclass
+@dataclass(slots=True)
 class Doc:
     document_id: int
     filepath: Path | str
     date: Optional[str] = None
     source: Optional[str] = None
     domain: Optional[str] = None
-    context: Optional[str] = None
\ No newline at end of file
+    context: Optional[str] = None
+
+    @classmethod
+    def from_obj(cls, obj: DocLike) -> "Doc":
+        """Copy a DocLike's fields straight across (no vars() dict or kwargs re-unpacking)."""
+        doc = cls.__new__(cls)
+        for field in cls.__slots__:
+            setattr(doc, field, getattr(obj, field, None))
+        return doc
\ No newline at end of file
@@ -0,0 +1,9 @@
+from dataclasses import dataclass
+
+@dataclass(slots=True, frozen=True)
+class EdgeRecord:
+    rel_id: int
+    src: str
+    tgt: str
+    strength: float
+    directed: bool
@@ -54,7 +54,7 @@ Format each relationship as:
 - The same entity may appear multiple times (distinct claims), but the `entity_name` and `entity_type` strings must be identical each time.
 
 -Quality-Control Checklist (must be TRUE before output)-
-[ ] Every entity_type ∈ {entity_types}
+[ ] Every entity_type is one of the Allowed Entity Types
 [ ] Every entity_claim is intrinsic to that entity (role, scope, mandate, attributes, status) and contains no cross-references ('by the ministry', 'in the review', 'referenced in captions')
 [ ] No tuple contains a generic/referential/banned entity
 [ ] No titles/honorifics/role descriptors inside PERSON names
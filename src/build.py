@@ -3,16 +3,23 @@ Build orchestrators (vectorDB // graph)
 """
 
 from __future__ import annotations
-from typing import Optional
+from typing import Callable, Optional
 import asyncio
+import logging
+import re
 from asyncio import Semaphore
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from string import Formatter
+
+import numpy as np
 
 # - local -
 from ..config import log, VectorDBConfig, GraphConfig, LLMConfig, HEAD
-from .state import VectorIndex, MetaIndex, GraphIndex
+from .state import VectorIndex, MetaIndex, GraphIndex, ResponseCache
 from .embed import Embedder
-from .llm import SyncLLM, AsyncLLM
-from .util import fetch_doc, chunk, print_progress_bar
+from .llm import SyncLLM, AsyncLLM, AdaptiveSemaphore
+from .util import fetch_doc, chunk, print_progress_bar, Truncated
 from ._schemas import (
     ChunkData,
     DocLike, Doc,
@@ -22,10 +29,87 @@ from ._schemas import (
 )
 
 
+_FIELD_STRIP = ' \t\r\n"' # whitespace and quotes around tuple fields
+
+
+def _partial_format(template: str, **values) -> str:
+    """
+    Substitute only the given fields of a str.format template and return a template
+    that still formats the remaining fields (literal braces stay escaped).
+    """
+    out = []
+    for literal, field, spec, conversion in Formatter().parse(template):
+        out.append(literal.replace("{", "{{").replace("}", "}}"))
+        if field is None:
+            continue
+        if field in values:
+            value = format(Formatter().convert_field(values[field], conversion), spec or "")
+            out.append(value.replace("{", "{{").replace("}", "}}"))
+        else:
+            out.append("{" + field + (f"!{conversion}" if conversion else "") + (f":{spec}" if spec else "") + "}")
+    return "".join(out)
+
+
+_TEMPLATE_FIELDS = {"tuple_delimiter", "record_delimiter", "completion_delimiter", "entity_types", "document", "context"}
+_DOC_FIELDS = {"document", "context"}
+
+
+def _validate_template(domain: str, template: str):
+    """Fail at init, not mid-build, on templates that can't be formatted."""
+    head, marker, tail = template.rpartition("**Document**:")
+    if not marker:
+        raise ValueError(f"Extraction template for domain '{domain}' has no '**Document**:' section")
+    for part, allowed in ((head, _TEMPLATE_FIELDS - _DOC_FIELDS), (tail, _TEMPLATE_FIELDS)):
+        try:
+            fields = {f for _, f, _, _ in Formatter().parse(part) if f is not None}
+        except ValueError as exc: # unbalanced braces
+            raise ValueError(f"Extraction template for domain '{domain}' is malformed: {exc}") from None
+        unexpected = fields - allowed
+        if unexpected:
+            where = "before" if part is head else "after"
+            raise ValueError(
+                f"Extraction template for domain '{domain}' has unexpected fields {sorted(unexpected)} "
+                f"{where} '**Document**:' (allowed: {sorted(allowed)}). Escape literal braces as {{{{ }}}}."
+            )
+    if "document" not in {f for _, f, _, _ in Formatter().parse(tail)}:
+        raise ValueError(f"Extraction template for domain '{domain}' never places {{document}} after '**Document**:'")
+
+
+def _compile_template(template: str) -> Callable[[str, str], str]:
+    """
+    Turn a template whose only fields are {document} and {context} into plain
+    string concatenation, so nothing gets parsed per call.
+    Anything fancier (format specs, other fields) falls back to str.format.
+    """
+    segments, fields, literal = [], [], ""
+    for text, field, spec, conversion in Formatter().parse(template): # parse() unescapes {{ }}
+        literal += text
+        if field is None:
+            continue
+        if field not in ("document", "context") or spec or conversion:
+            return lambda document, context: template.format(document=document, context=context)
+        segments.append(literal)
+        fields.append(field)
+        literal = ""
+    segments.append(literal)
+
+    if fields == ["document", "context"]: # the shape every shipped template uses
+        head, mid, tail = segments
+        return lambda document, context: head + document + mid + context + tail
+
+    head, rest = segments[0], list(zip(fields, segments[1:]))
+    def render(document: str, context: str) -> str:
+        values = {"document": document, "context": context}
+        return head + "".join(values[f] + lit for f, lit in rest)
+    return render
+
+
 # === VECTOR DB BUILDER ===
 
 class VectorDBBuilder:
     """Class for building the vector database."""
+
+    PREFETCH = 4 # documents chunked ahead of the embedder
     
     def __init__(self, cfg: VectorDBConfig):
         self.cfg = cfg
@@ -46,70 +130,114 @@ class VectorDBBuilder:
 
         if self.cfg.rebuild:
             self.meta_index.drop()
-        for doc in docs:
-            try:
-                self._process_doc(doc, self.cfg.rebuild)
-            except Exception as e:
-                log.error("Failed to process %s: %s", doc.filepath, e)
+        # chunking (file read + tokenization) runs ahead on a worker thread while we embed.
+        # one worker keeps the tokenizer single-threaded; the window keeps it busy.
+        # chunks from several docs are embedded together until cfg.batch_size is reached,
+        # so short docs don't each launch a tiny embedding batch
+        batch, batch_chunks = [], 0
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            for doc, chunked in self._prefetch_chunks(pool, docs):
+                try:
+                    chunks_data, chunks_text = chunked.result()
+                except Exception as e:
+                    log.error("Failed to process %s: %s", doc.filepath, e)
+                    self.stats.errors += 1
+                    continue
+                if not chunks_data or not chunks_text:
+                    self.stats.errors += 1
+                    continue
+                batch.append((doc, chunks_data, chunks_text))
+                batch_chunks += len(chunks_text)
+                if batch_chunks >= self.cfg.batch_size:
+                    self._flush_batch(batch)
+                    batch, batch_chunks = [], 0
+            if batch:
+                self._flush_batch(batch)
             
         self.vector_index.save()
         log.info("Processing complete: %s", self.stats)
 
 
-    def _process_doc(self, doc: DocLike, rebuild: bool):
-        """Chunk, embed, and upsert a single document file."""
-        
-        if not rebuild: # don't re-process docs if not rebuilding
-            if self.meta_index.has_chunks(doc.document_id):
-                return
-
-        # chunk document
-        chunks_data, chunks_text = chunk(doc.filepath, doc.document_id,
-            self.embedder, self.cfg.max_tokens, self.cfg.overlap)
-        if not chunks_data or not chunks_text:
-            self.stats.errors += 1
-            return
+    def _prefetch_chunks(self, pool: ThreadPoolExecutor, docs: list[DocLike]):
+        """Yield (doc, future of chunk(doc)), keeping up to PREFETCH chunk jobs in flight."""
+        window = deque()
+        seen = set()
+        for doc in docs:
+            if not self.cfg.rebuild: # don't re-process docs if not rebuilding
+                if doc.document_id in seen or self.meta_index.has_chunks(doc.document_id):
+                    continue
+            seen.add(doc.document_id)
+            window.append((doc, pool.submit(chunk, doc.filepath, doc.document_id,
+                self.embedder, self.cfg.max_tokens, self.cfg.overlap)))
+            if len(window) > self.PREFETCH:
+                yield window.popleft()
+        while window:
+            yield window.popleft()
+
+
+    def _flush_batch(self, batch: list[tuple[DocLike, list[ChunkData], list[str]]]):
+        errors = self.stats.errors
+        try:
+            self._process_batch(batch)
+        except Exception as e:
+            log.error("Failed to process %s: %s", ", ".join(str(doc.filepath) for doc, _, _ in batch), e)
+            self.stats.errors = errors + len(batch) # every doc in the batch, each counted once
+
 
+    def _process_batch(self, batch: list[tuple[DocLike, list[ChunkData], list[str]]]):
+        """Embed, add and upsert the chunks of several documents in one go."""
+        texts = [t for _, _, chunks_text in batch for t in chunks_text]
         try: # generate embeddings
-            embeddings = self.embedder.embed(chunks_text)
-            if embeddings.size == 0:
-                log.error("No embeddings generated for %s", doc.filepath)
-                self.stats.errors += 1
-                return
+            embeddings = self.embedder.embed(texts)
+            if len(embeddings) != len(texts):
+                raise ValueError(f"got {len(embeddings)} embeddings for {len(texts)} chunks")
+            per_doc = np.split(embeddings, np.cumsum([len(t) for _, _, t in batch])[:-1])
         except Exception as e:
-            log.error("Could not embed chunks for %s: %s", doc.filepath, e)
-            self.stats.errors += 1
+            # retry doc by doc so one bad document doesn't sink the whole batch
+            log.warning("Batch embedding failed (%s), retrying per document", e)
+            per_doc = [self._embed_doc(doc, chunks_text) for doc, _, chunks_text in batch]
+
+        done = [(doc, chunks_data, emb) for (doc, chunks_data, _), emb in zip(batch, per_doc) if emb is not None]
+        if not done:
             return
 
-        embedding_ids = self.vector_index.add_vectors(embeddings)
-    
-        if len(chunks_data) != len(embedding_ids):
-            msg = f"Mismatch between chunks ({len(chunks_data)}) and embeddings ({len(embedding_ids)})"
+        embeddings = np.concatenate([emb for _, _, emb in done])
+        chunks_data = [c for _, doc_chunks, _ in done for c in doc_chunks]
+
+        # check before add_vectors: raising after it would leave vectors without metadata
+        if len(chunks_data) != len(embeddings):
+            msg = f"Mismatch between chunks ({len(chunks_data)}) and embeddings ({len(embeddings)})"
             log.error(msg)
             raise ValueError(msg)
-        
-        # upsert batch
-        embedding_ids = [int(x) for x in embedding_ids]
-        chunks = [
-            ChunkData(
-                document_id=c.document_id,
-                start_token=c.start_token,
-                end_token=c.end_token,
-                start_char=c.start_char,
-                end_char=c.end_char,
-                source_path=c.source_path,
-                embedding_id=e_id,
-            )
-            for c, e_id in zip(chunks_data, embedding_ids)
-        ]
-        self.meta_index.upsert(chunks)
+        embedding_ids = self.vector_index.add_vectors(embeddings)
+
+        # upsert batch (add_vectors already hands back plain python ints).
+        # the ChunkData objects are fresh from chunk() and only ours, so fill them in place
+        for c, e_id in zip(chunks_data, embedding_ids):
+            c.embedding_id = e_id
+        self.meta_index.upsert(chunks_data)
 
         # update statistics
-        self.stats.documents_processed += 1
+        self.stats.documents_processed += len(done)
         self.stats.chunks_created += len(chunks_data)
         self.stats.embeddings_generated += len(embedding_ids)
 
 
+    def _embed_doc(self, doc: DocLike, chunks_text: list[str]) -> Optional[np.ndarray]:
+        """Embed a single document's chunks, or log + count the error and return None."""
+        try:
+            embeddings = self.embedder.embed(chunks_text)
+        except Exception as e:
+            log.error("Could not embed chunks for %s: %s", doc.filepath, e)
+            self.stats.errors += 1
+            return None
+        if embeddings.size == 0 or len(embeddings) != len(chunks_text):
+            log.error("No embeddings generated for %s", doc.filepath)
+            self.stats.errors += 1
+            return None
+        return embeddings
+
+
 # === GRAPH BUILDER ===
 
 class GraphBuilder:
@@ -129,11 +257,24 @@ class GraphBuilder:
             raise ValueError(f"Config missing required fields: {', '.join(missing)}")
 
         self.graph_index = GraphIndex(self.graph_config.graph_index_path)
+        self.response_cache = None
+        if self.graph_config.response_cache:
+            self.response_cache = ResponseCache(self.graph_config.response_cache_path)
         
         self.tuple_delimiter = self.graph_config.tuple_delimiter
         self.record_delimiter = self.graph_config.record_delimiter
         self.completion_delimiter = self.graph_config.completion_delimiter
 
+        # one record per match: optional "(", kind, delimited fields, optional ")", then the next
+        # record delimiter or the completion delimiter at the very end. the payload never crosses a
+        # record delimiter, so parentheses inside claims are fine and a malformed record can't
+        # swallow its neighbour; a completion delimiter mid-claim is just text.
+        td, rd, cd = (re.escape(d) for d in (self.tuple_delimiter, self.record_delimiter, self.completion_delimiter))
+        self._record_re = re.compile(
+            rf'(?:\A|(?<={rd}))\s*\(?\s*"?(entity|relationship)"?\s*{td}((?:(?!{rd}).)*?)\)?\s*(?={rd}|{cd}\s*\Z|\Z)',
+            re.IGNORECASE | re.DOTALL,
+        )
+
         self.extraction_domains = self.graph_config.extraction_domains
         self.extraction_templates = self.graph_config.extraction_templates
         self.entity_templates = self.graph_config.entity_templates
@@ -143,17 +284,27 @@ class GraphBuilder:
         _backend = self.graph_config.extraction_llm_backend
         _api_key = self.llm_config.api_key
         _url = self.llm_config.local_backend_url
+        _retries = self.llm_config.retries
         if self.extraction_concurrency == "sync":
             _model = self.llm_config.sync_model
-            self.llm = SyncLLM(backend=_backend, model=_model, api_key=_api_key, url=_url)
+            self.llm = SyncLLM(backend=_backend, model=_model, api_key=_api_key, url=_url, retries=_retries)
         elif self.extraction_concurrency == "async":
             _model = self.llm_config.async_model
-            self.llm = AsyncLLM(backend=_backend, model=_model, api_key=_api_key, url=_url)
+            _limiter = None
+            if self.llm_config.max_semaphore_rate: # opt-in adaptive concurrency
+                _limiter = AdaptiveSemaphore(self.llm_config.semaphore_rate, self.llm_config.max_semaphore_rate)
+            self.llm = AsyncLLM(backend=_backend, model=_model, api_key=_api_key, url=_url,
+                retries=_retries, limiter=_limiter)
         else:
             raise ValueError(f"graph_config.extraction_concurrency must be set to sync or async.")
+        # the rest of what goes into an LLM request, for the response cache key
+        # (no sampling settings are sent; they'd belong here if they were)
+        self._request_params = {"backend": _backend, "url": _url if _backend == "local" else None}
         
         self.llm.set_system(self.graph_config.system_prompt)
-        self.semaphore_rate = self.llm_config.semaphore_rate
+        self._prepare_prompts()
+        # with an adaptive limiter the LLM gates its own calls; this only caps docs in flight
+        self.semaphore_rate = max(self.llm_config.semaphore_rate, self.llm_config.max_semaphore_rate or 0)
         self.batch_size = self.graph_config.extraction_batch_size
 
         self.debug = debug
@@ -169,11 +320,15 @@ class GraphBuilder:
             raise ValueError("No documents provided to build graph")
         log.info(f"Now building graph with {total} document{'s' if total != 1 else ''}")
 
-        docs = [Doc(**vars(doc)) if not isinstance(doc, Doc) else doc for doc in docs]
-        if self.extraction_concurrency == "sync":
-            self._build_sync(docs)
-        else:
-            asyncio.run(self._build_async(docs))
+        docs = [doc if type(doc) is Doc else Doc.from_obj(doc) for doc in docs]
+        try:
+            if self.extraction_concurrency == "sync":
+                self._build_sync(docs)
+            else:
+                asyncio.run(self._build_async(docs))
+        finally:
+            if self.response_cache is not None:
+                self.response_cache.close() # reopened if build() runs again
 
     
     def _build_sync(self, docs: list[DocLike]):
@@ -182,7 +337,7 @@ class GraphBuilder:
         print_progress_bar(0, total)
         for i in range(0, len(docs), self.batch_size):
             batch = docs[i : i + self.batch_size]
-            entities_batch, relationships_batch = [], []
+            results = []
 
             for j, doc in enumerate(batch):
                 current = i + j + 1
@@ -192,22 +347,27 @@ class GraphBuilder:
                     domain=doc.domain,
                     context=doc.context,
                 )
-                response = self.llm.run(prompt)
-                if self.debug:
-                    log.info("LLM response: %s", response)
+                system = self._system_prompt(doc.domain)
+                key, response = self._cached_response(prompt, system)
+                if response is None:
+                    response = self.llm.run(prompt, system=system)
+                    self._cache_response(key, response)
+                self._log_response(response)
                 e, r = self._process_llm_response(response)
-                e, r = self._add_metadata(entities=e, relationships=r, date=doc.date, source=doc.source)
-                entities_batch.extend(e)
-                relationships_batch.extend(r)
+                results.append(self._add_metadata(entities=e, relationships=r, date=doc.date, source=doc.source))
                 print_progress_bar(current, total)
 
-            self._upsert_entities(entities_batch)
-            self._upsert_relationships(relationships_batch)
+            self._write_results(results)
             
 
     async def _build_async(self, docs: list[DocLike]):
         """"""
         sem = Semaphore(self.semaphore_rate)
+        # extraction pushes results here; a single writer drains them into the graph
+        # while the next batch is still waiting on the LLM
+        queue: asyncio.Queue = asyncio.Queue(maxsize=2 * self.batch_size)
+        failed: list[BaseException] = []
+
         async def _process_doc(doc):
             async with sem:
                 doc_text = await asyncio.to_thread(fetch_doc, doc.filepath)
@@ -216,38 +376,129 @@ class GraphBuilder:
                     domain=doc.domain,
                     context=doc.context,
                 )
-                response = await self.llm.run(prompt)
-                if self.debug:
-                    log.info("LLM response: %s", response)
-                e, r = await asyncio.to_thread(self._process_llm_response, response)
-                return await asyncio.to_thread(self._add_metadata,
-                    entities=e, relationships=r, date=doc.date, source=doc.source
-                )
-        
-        for i in range(0, len(docs), self.batch_size):
-            batch = docs[i : i + self.batch_size]
-            results = await asyncio.gather(*[_process_doc(doc) for doc in batch])
-
-            entities_batch, relationships_batch = [], []
-            for e, r in results:
-                entities_batch.extend(e)
-                relationships_batch.extend(r)
-
+                system = self._system_prompt(doc.domain)
+                key, response = self._cached_response(prompt, system)
+                if response is None and self.graph_config.stream_extraction:
+                    response = await self._stream_extraction(prompt, system, doc, queue)
+                    self._cache_response(key, response)
+                    self._log_response(response)
+                    return
+                if response is None:
+                    response = await self.llm.run(prompt, system=system)
+                    self._cache_response(key, response)
+                self._log_response(response)
+                # parsing is cheap string work; a thread-pool hop would cost more than it saves
+                e, r = self._process_llm_response(response)
+                await queue.put(self._add_metadata(entities=e, relationships=r, date=doc.date, source=doc.source))
+
+        async def _writer():
+            while True:
+                results = [await queue.get()]
+                while len(results) < self.batch_size and not queue.empty():
+                    results.append(queue.get_nowait())
+                try:
+                    if not failed: # after a failed write, keep draining so join() returns
+                        await asyncio.to_thread(self._write_results, results)
+                except Exception as exc:
+                    failed.append(exc)
+                finally:
+                    for _ in results:
+                        queue.task_done()
+
+        writer_task = asyncio.create_task(_writer())
+        tasks: list[asyncio.Task] = []
+        try:
+            for i in range(0, len(docs), self.batch_size):
+                batch = docs[i : i + self.batch_size]
+                if i == 0 and self.graph_config.warm_prompt_cache:
+                    # first call alone so the provider caches the shared prefix before fan-out
+                    await _process_doc(batch[0])
+                    batch = batch[1:]
+                tasks = [asyncio.create_task(_process_doc(doc)) for doc in batch]
+                for done in asyncio.as_completed(tasks):
+                    await done
+                tasks = []
+                if failed:
+                    break
+        finally:
+            # if an extraction raised, stop the rest of its batch, but still write every
+            # result that was already queued before the error goes up
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await queue.join()
+            writer_task.cancel()
+        if failed:
+            raise failed[0]
+
+
+    async def _stream_extraction(self, prompt: str, system: list[dict], doc: Doc, queue: asyncio.Queue) -> str:
+        """
+        Stream the LLM response and queue each record as soon as its record delimiter
+        arrives, instead of waiting for the whole response. Returns the full response text.
+        """
+        parts, buf = [], ""
+        rd = self.record_delimiter
+        async for piece in self.llm.run_stream(prompt, system=system):
+            parts.append(piece)
+            buf += piece
+            if rd not in buf:
+                continue
+            *blocks, buf = buf.split(rd)
+            e, r = self._process_llm_response(rd.join(blocks))
+            if e or r:
+                await queue.put(self._add_metadata(entities=e, relationships=r, date=doc.date, source=doc.source))
+        e, r = self._process_llm_response(buf) # last record, up to the completion delimiter
+        if e or r:
+            await queue.put(self._add_metadata(entities=e, relationships=r, date=doc.date, source=doc.source))
+        return "".join(parts).strip()
+
+
+    def _write_results(self, results: list[tuple[list[dict], list[dict]]]):
+        """Upsert a list of (entities, relationships) extraction results in one transaction."""
+        entities_batch, relationships_batch = [], []
+        for e, r in results:
+            entities_batch.extend(e)
+            relationships_batch.extend(r)
+
+        with self.graph_index.bulk(): # one commit per batch instead of one per row
             self._upsert_entities(entities_batch)
             self._upsert_relationships(relationships_batch)
 
 
+    def _log_response(self, response: str):
+        # debug=True is the opt-in; the nexus logger's level is left to config / the caller
+        if self.debug and log.isEnabledFor(logging.INFO):
+            log.info("LLM response: %s", Truncated(response)) # only cut + formatted if emitted
+
+
+    def _cached_response(self, prompt: str, system: list[dict]) -> tuple[Optional[str], Optional[str]]:
+        """Return (cache key, cached response). Both are None when the response cache is disabled."""
+        if self.response_cache is None:
+            return None, None
+        key = self.response_cache.key(self.llm.model, system, prompt, self._request_params)
+        return key, self.response_cache.get(key)
+
+
+    def _cache_response(self, key: Optional[str], response: str):
+        if self.response_cache is not None and key is not None:
+            self.response_cache.put(key, self.llm.model, response)
+
+
     def _upsert_entities(self, entities: list[dict]):
         """Upsert a batch of entities and their claims"""
-        for entity in entities:
-            entity_name = entity["entity_name"]
-            entity_type = entity["entity_type"]
-            claim = entity.get("entity_claim")
-            claim_date = entity.get("claim_date", None)
-            source = entity.get("source", None)
-
-            self.graph_index.upsert_entity(name=entity_name, entity_type=entity_type)
-            self.graph_index.upsert_claim(content=claim,source=source, entity_name=entity_name, claim_date=claim_date)
+        # upsert_claims() writes each entity once (last non-None type wins, as per-row upserts
+        # would) and keeps the claims in extraction order
+        self.graph_index.upsert_claims(
+            dict(
+                content=entity.get("entity_claim"),
+                source=entity.get("source", None),
+                entity_name=entity["entity_name"],
+                entity_type=entity["entity_type"],
+                claim_date=entity.get("claim_date", None),
+            )
+            for entity in entities
+        )
 
 
     def _upsert_relationships(self, relationships: list[dict]):
@@ -259,14 +510,11 @@ class GraphBuilder:
             claim_date = relationship.get("claim_date", None)
             source = relationship.get("source", None)
 
-            rel = RelationshipRecord(
-                source_name=source_name,
-                target_name=target_name,
-                directed=False # | TODO: manipulate directionality at ingest
-            )
-            
+            # | TODO: manipulate directionality at ingest (directed=False for now)
+            rel = RelationshipRecord(source_name, target_name)
             try:
-                self.graph_index.upsert_relationship(source_name=source_name, target_name=target_name)
+                # upsert_claim() upserts the relationship itself, so no separate upsert_relationship() here
+                self.graph_index.upsert_claim(content=claim, source=source, relationship=rel, claim_date=claim_date)
             except RelationshipCollisionError:
                 # RelationshipCollisionError only raises when trying to relate an entity to itself,
                 # i.e. resolve_alias(source_name) == resolve_alias(target_name).
@@ -276,9 +524,44 @@ class GraphBuilder:
                     source_name, target_name, source_name # NOTE: not fully accurate... we upsert to _canon_ of source.
                 )
                 self.graph_index.upsert_claim(content=claim, source=source, entity_name=source_name, claim_date=claim_date)
-                continue
 
-            self.graph_index.upsert_claim(content=claim, source=source, relationship=rel, claim_date=claim_date)
+
+    def _prepare_prompts(self):
+        """
+        Split every extraction template into a static per-domain system prompt
+        (instructions, examples, entity types) and a small per-document tail.
+        Keeping the static part identical across calls lets providers serve it from their prefix cache.
+        """
+        cache_control = self.graph_config.prompt_cache_control
+        self._system_prompts: dict[str, list[dict]] = {}
+        self._prompt_fns: dict[str, Callable[[str, str], str]] = {}
+        for domain, template in self.extraction_templates.items():
+            _validate_template(domain, template)
+            head, marker, tail = template.rpartition("**Document**:")
+            static = head.format(
+                tuple_delimiter=self.tuple_delimiter,
+                record_delimiter=self.record_delimiter,
+                completion_delimiter=self.completion_delimiter,
+                entity_types=self.entity_templates.get(domain, []),
+            ).strip()
+            content = f"{self.graph_config.system_prompt}\n\n{static}"
+            self._system_prompts[domain] = self.llm.system_message(content, cache_control)
+            # delimiters never change, so bake them in now and leave only {document}/{context}
+            self._prompt_fns[domain] = _compile_template(_partial_format(
+                marker + tail,
+                tuple_delimiter=self.tuple_delimiter,
+                record_delimiter=self.record_delimiter,
+                completion_delimiter=self.completion_delimiter,
+            ))
+
+
+    def _system_prompt(self, domain: Optional[str] = None) -> list[dict]:
+        if domain is None:
+            domain = self.extraction_domains[0]
+        system = self._system_prompts.get(domain)
+        if system is None:
+            raise ValueError(f"Domain '{domain}' not found in extraction_templates")
+        return system
 
 
     def _build_extraction_prompt(self,
@@ -286,46 +569,28 @@ class GraphBuilder:
         domain: Optional[str] = None,
         context: Optional[str] = None,
     ) -> str:
+        """Per-document user message; the static instructions live in the domain's system prompt."""
         if domain is None:
             domain = self.extraction_domains[0]
-        base_template = self.extraction_templates.get(domain)
-        entity_types: list[str] = self.entity_templates.get(domain, [])
-        if base_template is None:
+        render = self._prompt_fns.get(domain)
+        if render is None:
             raise ValueError(f"Domain '{domain}' not found in extraction_templates")
         
         optional_context = f"\n**Additional context for this document**: {context}" if context else ""
-        return base_template.format(
-            tuple_delimiter=self.tuple_delimiter,
-            record_delimiter=self.record_delimiter,
-            completion_delimiter=self.completion_delimiter,
-            entity_types=entity_types,
-            document=document,
-            context=optional_context
-        )
+        return render(document, optional_context)
 
 
     def _process_llm_response(self, llm_response: str) -> tuple[list[dict], list[dict]]:
         """parse relationships / entities from llm's response"""
-        def _clean(s: str) -> str:
-            return s.strip().strip('"').strip()
-        
-        try:
-            text = llm_response.strip().rstrip(self.completion_delimiter)
-            blocks = text.split(self.record_delimiter)
-        except Exception as exc:
-            log.exception("Failed to preprocess LLM response: %s", exc)
+        if not isinstance(llm_response, str):
+            log.error("Failed to preprocess LLM response: expected str, got %s", type(llm_response).__name__)
             return [], []
 
         entities, relationships = [], []
-        for block in blocks:
-            block = block.strip().removeprefix("(").removesuffix(")")
-            if not block: continue
-            
+        for match in self._record_re.finditer(llm_response.strip()):
+            kind = match.group(1).lower()
+            fields = [f.strip(_FIELD_STRIP) for f in match.group(2).split(self.tuple_delimiter)]
             try:
-                kind, *raw_fields = block.split(self.tuple_delimiter)
-                kind = _clean(kind).lower()
-                fields = [_clean(f) for f in raw_fields]
-
                 if kind == "entity":
                     name, etype, claim = fields
                     entities.append({
@@ -333,7 +598,7 @@ class GraphBuilder:
                         "entity_type": etype,
                         "entity_claim": claim
                     })
-                elif kind == "relationship":
+                else:
                     src, tgt, claim = fields
                     relationships.append({
                         "source_name": src,
@@ -341,7 +606,7 @@ class GraphBuilder:
                         "relationship_claim": claim
                     })
             except Exception as exc:
-                log.error("Failed to parse block: %s | Message: %s", block, exc)
+                log.error("Failed to parse block: %s | Message: %s", match.group(0).strip(), exc)
                 continue  # skip malformed block
         return entities, relationships
     
@@ -349,7 +614,11 @@ class GraphBuilder:
     def _add_metadata(self,
         entities: list[dict], relationships: list[dict], date: Optional[str]=None, source: Optional[str]=None,
     ):
-        return (
-            [{**e, "claim_date": date, "source": source} for e in entities],
-            [{**r, "claim_date": date, "source": source} for r in relationships]
-        )
+        # the dicts are fresh from _process_llm_response, so tag them in place rather than copying
+        for record in entities:
+            record["claim_date"] = date
+            record["source"] = source
+        for record in relationships:
+            record["claim_date"] = date
+            record["source"] = source
+        return entities, relationships
@@ -46,6 +46,12 @@ class Embedder:
         return self.tokenizer.encode(text, truncation=False, add_special_tokens=False)
 
 
+    def encode_offsets(self, text) -> tuple[list[int], list[tuple[int, int]]]:
+        """Token ids plus each token's (start, end) char span in text. Needs a fast tokenizer."""
+        enc = self.tokenizer(text, truncation=False, add_special_tokens=False, return_offsets_mapping=True)
+        return enc["input_ids"], enc["offset_mapping"]
+
+
     def decode(self, encoding: list[int]) -> str:
         return self.tokenizer.decode(encoding, skip_special_tokens=True).strip()
 
@@ -1,10 +1,160 @@
-# nexus/src/fastquery.py
+"""
+In-memory query engine over a GraphIndex snapshot.
+
+FastQueryEngine loads everything once (alias map, entity ids, relationships as
+CSR arrays, claim maps) and answers traversal/claim queries without touching SQLite.
+"""
+
 from __future__ import annotations
-from collections import defaultdict, deque
-from typing import Dict, List, Tuple, Optional, Any
+from collections import defaultdict
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
+from operator import itemgetter
+import os
+import sys
+import threading
+from typing import Dict, List, Tuple, Optional
+
+import numpy as np
 
 from .state import GraphIndex
-from ._schemas import ClaimData  # adjust import path to match your project
+from ._schemas import ClaimData, EdgeRecord, RelationshipRecord, EntityNotFoundError
+from .graph import Entity, Relationship
+
+_NEIGHBOURS_CACHE_SIZE = 4096 # (name, depth) results kept per engine
+
+
+class _FrozenDict(dict):
+    """
+    A dict that refuses changes, for results shared between callers. Still a dict, so
+    json.dumps, ** and dict(...) work; copy / deepcopy / pickle give plain dicts.
+    """
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("shared read-only result; copy it with dict(...) to modify")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+    def __copy__(self):
+        return dict(self)
+
+
+def _frontier_edges(indptr: np.ndarray, frontier: np.ndarray) -> np.ndarray:
+    """Edge positions of every node in frontier, concatenated in frontier order."""
+    starts = indptr[frontier]
+    counts = indptr[frontier + 1] - starts
+    total = int(counts.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    # arange over all edges, shifted per node so each run starts at that node's indptr
+    return np.arange(total, dtype=np.int64) + np.repeat(starts - (np.cumsum(counts) - counts), counts)
+
+
+def _bfs_levels(indptr: np.ndarray, indices: np.ndarray, start: int, depth: int):
+    """
+    Level-synchronous BFS, one vectorized step per level.
+    Yields (edge positions, nodes) of each level's newly reached nodes, in the same
+    order a node-by-node BFS would discover them (first edge to reach a node wins).
+    """
+    visited = np.zeros(len(indptr) - 1, dtype=np.bool_)
+    visited[start] = True
+    frontier = np.array([start], dtype=np.int64)
+    for _ in range(depth):
+        pos = _frontier_edges(indptr, frontier)
+        nbrs = indices[pos]
+        fresh = ~visited[nbrs]
+        pos, nbrs = pos[fresh], nbrs[fresh]
+        if len(nbrs) == 0:
+            return
+        _, first = np.unique(nbrs, return_index=True)
+        first.sort()
+        pos, nbrs = pos[first], nbrs[first]
+        visited[nbrs] = True
+        yield pos, nbrs
+        frontier = nbrs.astype(np.int64)
+
+
+def _multi_bfs_lanes(indptr: np.ndarray, indices: np.ndarray, starts: np.ndarray, depth: int) -> np.ndarray:
+    """
+    Multi-source BFS for up to 64 starts: bit i of visited[u] is set once start i reaches u.
+    All lanes advance together, so each level scans the union frontier's edges once.
+    """
+    n = len(indptr) - 1
+    visited = np.zeros(n, dtype=np.uint64)
+    lanes = np.left_shift(np.uint64(1), np.arange(len(starts), dtype=np.uint64))
+    np.bitwise_or.at(visited, starts, lanes)
+    frontier = visited.copy()
+    for _ in range(depth):
+        active = np.flatnonzero(frontier)
+        if len(active) == 0:
+            break
+        pos = _frontier_edges(indptr, active)
+        if len(pos) == 0:
+            break
+        owners = np.repeat(active, indptr[active + 1] - indptr[active])
+        reached = np.zeros(n, dtype=np.uint64)
+        np.bitwise_or.at(reached, indices[pos], frontier[owners])
+        frontier = reached & ~visited
+        visited |= frontier
+    return visited
+
+
+def _dfs_order(indptr: np.ndarray, indices: np.ndarray, start: int, max_depth: int) -> List[int]:
+    """
+    Depth-limited preorder DFS from start, with an explicit stack instead of recursion.
+    Each node pushes its edges once (when first visited), so len(indices) + 1 slots always suffice.
+    """
+    visited = np.zeros(len(indptr) - 1, dtype=np.uint8)
+    stack_node = np.empty(len(indices) + 1, dtype=np.int32)
+    stack_depth = np.empty(len(indices) + 1, dtype=np.int32)
+    stack_node[0], stack_depth[0] = start, 0
+    sp = 1
+    order = []
+    while sp > 0:
+        sp -= 1
+        u, d = int(stack_node[sp]), int(stack_depth[sp])
+        if visited[u] or d > max_depth:
+            continue
+        visited[u] = 1
+        order.append(u)
+        if d == max_depth:
+            continue
+        lo, hi = indptr[u], indptr[u + 1]
+        k = hi - lo
+        # reversed, so the first neighbour is popped (explored) first
+        stack_node[sp : sp + k] = indices[lo:hi][::-1]
+        stack_depth[sp : sp + k] = d + 1
+        sp += k
+    return order
+
+
+def _walk_scores(indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray, start: int, depth: int) -> np.ndarray:
+    """
+    Best path score (product of edge strengths) from start to every node within depth hops;
+    -inf where unreached. Each level relaxes only the edges of nodes whose score just improved.
+    """
+    n = len(indptr) - 1
+    scores = np.full(n, -np.inf)
+    scores[start] = 1.0
+    frontier = np.array([start], dtype=np.int64)
+    for _ in range(depth):
+        pos = _frontier_edges(indptr, frontier)
+        if len(pos) == 0:
+            break
+        owners = np.repeat(frontier, indptr[frontier + 1] - indptr[frontier])
+        relaxed = np.full(n, -np.inf)
+        np.maximum.at(relaxed, indices[pos], scores[owners] * weights[pos])
+        improved = relaxed > scores
+        scores[improved] = relaxed[improved]
+        frontier = np.flatnonzero(improved)
+    return scores
+
 
 class FastQueryEngine:
     """
@@ -12,81 +162,242 @@ class FastQueryEngine:
     """
 
     def __init__(self, index: GraphIndex):
-        # allow either: pass existing GraphIndex or path
         self.index = index
 
         # In-memory data structures
-        # Map names -> canonical name (GraphIndex.resolve_alias already exists)
+        # Map names -> canonical name, snapshot of the aliases table (see _resolve)
+        self.alias_map: Dict[str, str] = {}
         # Map canonical name -> entity_id
         self.entity_name_to_id: Dict[str, int] = {}
         # Map entity_id -> canonical name
         self.entity_id_to_name: Dict[int, str] = {}
 
         # relationship_id -> relationship record
-        self.relationships: Dict[int, Dict[str, Any]] = {}
+        self.relationships: Dict[int, EdgeRecord] = {}
+        # endpoint lookup for Relationship(engine=...):
+        # (frozenset({canonical src, canonical tgt}), False) for undirected,
+        # ((src, tgt), True) for directed
+        self.rel_by_endpoints: Dict[tuple, RelationshipRecord] = {}
 
-        # adjacency: canonical_name -> list of (relationship_id, neighbor_name, strength, directed)
-        self.adj: Dict[str, List[Tuple[int, str, float, bool]]] = defaultdict(list)
+        # CSR adjacency over dense node ids, built on the first traversal (see _adj_lookup):
+        # node u's edges are [indptr[u], indptr[u+1]) in indices (neighbour node), edge_rel and weights. weights is float32 with the
+        # directed flag packed into the sign bit (-strength = directed), see _strength/_directed;
+        # exact float64 strengths stay in self.relationships
+        self.node_id: Dict[str, int] = {}
+        self.node_name: List[str] = []
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.indices = np.empty(0, dtype=np.int32)
+        self.edge_rel = np.empty(0, dtype=np.int64)
+        self.weights = np.empty(0, dtype=np.float32)
+        # reverse CSR (edges *into* each node) for searching backwards from a target;
+        # redge maps each reverse slot to its forward edge position
+        self.rindptr = np.zeros(1, dtype=np.int64)
+        self.rindices = np.empty(0, dtype=np.int32)
+        self.redge = np.empty(0, dtype=np.int64)
+        # per-relationship columns (rel id, src node, tgt node, |strength|, directed), filled by _load_all
+        self._rel_cols: Tuple[np.ndarray, ...] = ()
 
         # claim lookups
         self.claims_for_entity: Dict[int, List[ClaimData]] = defaultdict(list)
         self.claims_for_relationship: Dict[int, List[ClaimData]] = defaultdict(list)
 
+        # per-instance LRU memo for neighbours(), keyed on (name, depth, _version) so
+        # bump_version() invalidates it; plain data, so it doesn't keep the engine alive
+        self._version = 0
+        self._neighbours_memo: OrderedDict[tuple, _FrozenDict] = OrderedDict()
+        self._neighbours_lock = threading.Lock()
+
+        # Entity / Relationship objects over the loaded maps, built on first request and
+        # then shared (see get_entity / get_relationship)
+        self._entity_objs: Dict[str, Entity] = {}
+        self._rel_objs: Dict[int, Relationship] = {}
+
         # Load everything
         self._load_all()
 
     def _load_all(self):
-        # 1) Build entity name/id maps (pull from GraphIndex)
-        for name in self.index.list_all_entities():
-            # list_all_entities returns canonical names
-            with self.index._conn() as con:
-                row = con.execute("SELECT id FROM entities WHERE name = ?;", (name,)).fetchone()
-                if row:
-                    ent_id = row[0]
-                    self.entity_name_to_id[name] = ent_id
-                    self.entity_id_to_name[ent_id] = name
-
-        # 2) Load relationships (use helper in GraphIndex)
-        rel_rows = self.index.dump_all_relationships()
-        for r in rel_rows:
+        # 1) Build entity name/id maps in one query (same rows list_all_entities() walks)
+        with self.index._read() as con:
+            rows = con.execute("SELECT id, name FROM entities;").fetchall()
+        # names are interned so every map/edge shares one str (cached hash, identity compares)
+        for ent_id, name in rows:
+            name = sys.intern(name)
+            self.entity_name_to_id[name] = ent_id
+            self.entity_id_to_name[ent_id] = name
+        # dense node ids for the CSR arrays; every relationship endpoint is an entity
+        self.node_name = list(self.entity_name_to_id)
+        self.node_id = {name: i for i, name in enumerate(self.node_name)}
+
+        # alias -> canonical name, so lookups never go back to SQLite
+        with self.index._read() as con:
+            self.alias_map = {
+                sys.intern(alias): sys.intern(name)
+                for alias, name in con.execute("""
+                    SELECT a.alias, e.name FROM aliases a JOIN entities e ON e.id = a.entity_id;
+                """)
+            }
+
+        # 2) Stream relationships off the cursor into arrays sized up front, so the rows
+        # are never held as a list; _init_adj builds the CSR from these columns
+        with self.index._read() as con:
+            m = con.execute("SELECT COUNT(*) FROM relationships;").fetchone()[0]
+        rel_ids = np.empty(m, dtype=np.int64)
+        rel_src = np.empty(m, dtype=np.int64)
+        rel_tgt = np.empty(m, dtype=np.int64)
+        rel_strength = np.empty(m, dtype=np.float32)
+        rel_directed = np.empty(m, dtype=np.bool_)
+        i = 0
+        for r in self.index.iter_all_relationships():
             rel_id = int(r["relationship_id"])
-            src = r["source_name"]
-            tgt = r["target_name"]
+            src = sys.intern(r["source_name"])
+            tgt = sys.intern(r["target_name"])
             strength = float(r["strength"]) if r["strength"] is not None else 0.0
             directed = bool(r["directed"])
 
-            self.relationships[rel_id] = {
-                "relationship_id": rel_id,
-                "source": src,
-                "target": tgt,
-                "strength": strength,
-                "directed": directed
-            }
+            self.relationships[rel_id] = EdgeRecord(rel_id, src, tgt, strength, directed)
+            rel_ids[i], rel_src[i], rel_tgt[i] = rel_id, self.node_id[src], self.node_id[tgt]
+            rel_strength[i], rel_directed[i] = abs(strength), directed
+            i += 1
 
-            # adjacency: store rel_id so we can map claims later
-            self.adj[src].append((rel_id, tgt, strength, directed))
-            if not directed:
-                # for undirected, also add reverse adjacency referencing same rel_id
-                self.adj[tgt].append((rel_id, src, strength, directed))
-
-        # 3) Load claims (use helper)
-        claim_rows = self.index.dump_all_claims()
-        for c in claim_rows:
-            claim = ClaimData(
-                content=c["content"],
-                source=c["source"],
-                date_added=c["date_added"]
-            )
-            ent_id = c["entity_id"]
-            rel_id = c["relationship_id"]
+            self._index_endpoints(src, tgt, r["strength"], directed)
+        self._rel_cols = (rel_ids[:i], rel_src[:i], rel_tgt[:i], rel_strength[:i], rel_directed[:i])
+
+        # 3) Load claims, sorted by owner so each entity/relationship's list is built in one run
+        with self.index._read() as con:
+            claim_rows = con.execute("""
+                SELECT entity_id, relationship_id, content, source, date_added, claim_date
+                FROM claims
+                ORDER BY entity_id, relationship_id, id;
+            """).fetchall()
+        for (ent_id, rel_id), group in groupby(claim_rows, key=itemgetter(0, 1)):
+            claims = [
+                ClaimData(content=c[2], source=c[3], date_added=c[4], claim_date=c[5])
+                for c in group
+            ]
+            # exactly one of entity_id / relationship_id is set (CHECK constraint)
             if ent_id is not None:
-                self.claims_for_entity[int(ent_id)].append(claim)
-            if rel_id is not None:
-                self.claims_for_relationship[int(rel_id)].append(claim)
+                self.claims_for_entity[int(ent_id)] = claims
+            else:
+                self.claims_for_relationship[int(rel_id)] = claims
+
+    def _index_endpoints(self, src: str, tgt: str, strength: Optional[float], directed: bool):
+        """Add one relationship row to rel_by_endpoints (mirrors Relationship's DB matching)."""
+        if directed:
+            # directed lookups match the stored names exactly
+            self.rel_by_endpoints.setdefault(
+                ((src, tgt), True), RelationshipRecord(src, tgt, strength, True)
+            )
+            return
+        canon_src, canon_tgt = self._resolve(src), self._resolve(tgt)
+        if canon_src == canon_tgt:
+            return
+        ends = (canon_src, canon_tgt)
+        key = (frozenset(ends), False)
+        prev = self.rel_by_endpoints.get(key)
+        # like load_relationships, prefer a row a canonical entity sits on over an alias-entity's row
+        if prev is None or (
+            (src in ends or tgt in ends)
+            and not (prev.source_name in ends or prev.target_name in ends)
+        ):
+            self.rel_by_endpoints[key] = RelationshipRecord(src, tgt, strength, False)
+
+    def _init_adj(self):
+        """
+        Build the CSR arrays from the relationship columns _load_all streamed in (count, then fill).
+        Each node's edges keep relationship order, an undirected relationship adding its
+        reverse edge right after the forward one.
+        """
+        rel_ids, src, tgt, strength, directed = self._rel_cols
+        n, m = len(self.node_name), len(rel_ids)
+
+        # interleave forward/reverse slots per relationship, then drop directed reverses
+        keep = np.column_stack((np.ones(m, dtype=np.bool_), ~directed)).ravel()
+        owner = np.column_stack((src, tgt)).ravel()[keep]
+        nbr = np.column_stack((tgt, src)).ravel()[keep]
+        edge_rel = np.repeat(rel_ids, 2)[keep]
+        weights = np.repeat(np.where(directed, -strength, strength), 2)[keep]
+
+        # count: degrees -> indptr; fill: a stable sort by owner drops every edge into
+        # its node's slot range in original order (the per-node write cursor, vectorized)
+        degrees = np.bincount(owner, minlength=n)
+        self.indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(degrees, out=self.indptr[1:])
+        order = np.argsort(owner, kind="stable")
+        self.indices = nbr[order].astype(np.int32)
+        self.edge_rel = edge_rel[order]
+        self.weights = weights[order]
+
+        edge_src = np.repeat(np.arange(n, dtype=np.int32), degrees)
+        self.redge = np.argsort(self.indices, kind="stable").astype(np.int64)
+        self.rindices = edge_src[self.redge]
+        self.rindptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.indices, minlength=n), out=self.rindptr[1:])
+
+    def _adj_lookup(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (indptr, indices), every traversal calls this. The first call builds the CSR arrays
+        and shadows this method with a closure over them, so later calls skip the check
+        entirely. The closure holds the arrays, not self, so the engine isn't kept in a cycle.
+        """
+        self._init_adj()
+        adj = (self.indptr, self.indices)
+        self._adj_lookup = lambda: adj
+        return adj
+
+    def _resolve(self, name: str) -> str:
+        """In-memory GraphIndex.resolve_alias: canonical name for an alias, else the name itself."""
+        return self.alias_map.get(name, name)
+
+    def get_entity(self, name: str) -> Entity:
+        """Shared Entity for name (alias ok); raises EntityNotFoundError if unknown."""
+        canonical = self._resolve(name)
+        entity = self._entity_objs.get(canonical)
+        if entity is None:
+            if canonical not in self.entity_name_to_id:
+                raise EntityNotFoundError(name)
+            # setdefault: threads racing on a first build all get the same object
+            entity = self._entity_objs.setdefault(canonical, Entity.from_name(canonical, self))
+        return entity
+
+    def get_relationship(self, relationship_id: int) -> Optional[Relationship]:
+        """Shared Relationship for a relationship id, or None."""
+        relationship = self._rel_objs.get(relationship_id)
+        if relationship is None:
+            rel = self.relationships.get(relationship_id)
+            if rel is None or self._resolve(rel.src) == self._resolve(rel.tgt):
+                return None # a self-loop through an alias; Relationship() refuses these too
+            relationship = self._rel_objs.setdefault(relationship_id, Relationship.from_record(
+                RelationshipRecord(rel.src, rel.tgt, rel.strength, rel.directed), self
+            ))
+        return relationship
+
+    def relationship(self, src: str, tgt: str, directed: bool = False) -> Relationship:
+        """Relationship bound to this engine's index, matched in memory."""
+        return Relationship(src, tgt, strength=None, state=self.index, directed=directed, engine=self)
+
+    @staticmethod
+    def _strength(weights: np.ndarray) -> np.ndarray:
+        return np.abs(weights)
+
+    @staticmethod
+    def _directed(weights: np.ndarray) -> np.ndarray:
+        return np.signbit(weights) # true for -0.0 too, so zero-strength directed edges survive
+
+    def _edges(self, node: int):
+        """(relationship_id, neighbour node, strength, directed) for each edge out of node."""
+        self._adj_lookup()
+        lo, hi = self.indptr[node], self.indptr[node + 1]
+        rel_ids = self.edge_rel[lo:hi].tolist()
+        return zip(
+            rel_ids,
+            self.indices[lo:hi].tolist(),
+            [self.relationships[r].strength for r in rel_ids],
+            self._directed(self.weights[lo:hi]).tolist(),
+        )
 
     # Convenience: get claims for entity name
     def get_entity_claims_by_name(self, entity_name: str) -> List[ClaimData]:
-        canonical = self.index.resolve_alias(entity_name)
+        canonical = self._resolve(entity_name)
         ent_id = self.entity_name_to_id.get(canonical)
         if ent_id is None:
             return []
@@ -96,79 +407,188 @@ class FastQueryEngine:
     def get_relationship_claims(self, relationship_id: int) -> List[ClaimData]:
         return self.claims_for_relationship.get(relationship_id, [])
 
+    def bump_version(self):
+        """Invalidate cached traversal results; call after changing the loaded maps in place."""
+        self._version += 1
+
     # neighbors returns structured items including relationship id and claims
     def neighbours(self, entity_name: str, depth: int = 1):
-        canonical = self.index.resolve_alias(entity_name)
-        if canonical not in self.adj and canonical not in self.entity_name_to_id:
+        """
+        Cached per (canonical name, depth). Results are shared between callers, so they're
+        read-only: {depth: tuple of items}, each item a dict that raises TypeError on
+        changes, with claim lists as tuples. They json.dumps as usual; copy to modify.
+        """
+        self._adj_lookup()
+        canonical = self._resolve(entity_name)
+        if canonical not in self.node_id:
             return []  # unknown node
+        key = (canonical, depth, self._version)
+        memo = self._neighbours_memo
+        with self._neighbours_lock:
+            result = memo.get(key)
+            if result is not None:
+                memo.move_to_end(key)
+                return result
+        result = self._neighbours(canonical, depth)
+        with self._neighbours_lock:
+            memo[key] = result
+            if len(memo) > _NEIGHBOURS_CACHE_SIZE:
+                memo.popitem(last=False) # least recently used
+        return result
+
+    def _neighbours(self, canonical: str, depth: int) -> _FrozenDict:
+        start = self.node_id[canonical]
 
         # Level 0: the node itself with node claims
         base_ent_id = self.entity_name_to_id.get(canonical)
-        result = {0: [{
+        result = {0: (_FrozenDict({
             "entity_name": canonical,
             "entity_id": base_ent_id,
             "relationship_id": None,
-            "entity_claims": self.claims_for_entity.get(base_ent_id, []),
-            "relationship_claims": []
-        }]}
+            "entity_claims": tuple(self.claims_for_entity.get(base_ent_id, ())),
+            "relationship_claims": ()
+        }),)}
 
-        visited = {canonical}
-        frontier = [canonical]
-
-        for d in range(1, depth + 1):
-            next_frontier = []
+        for d, (pos, nbrs) in enumerate(_bfs_levels(self.indptr, self.indices, start, depth), start=1):
             level_items = []
-            for src in frontier:
-                for (rel_id, nbr_name, strength, directed) in self.adj.get(src, []):
-                    if nbr_name in visited:
-                        continue
-                    visited.add(nbr_name)
-                    next_frontier.append(nbr_name)
-
-                    nbr_ent_id = self.entity_name_to_id.get(nbr_name)
-                    level_items.append({
-                        "entity_name": nbr_name,
-                        "entity_id": nbr_ent_id,
-                        "relationship_id": rel_id,
-                        "entity_claims": self.claims_for_entity.get(nbr_ent_id, []),
-                        "relationship_claims": self.claims_for_relationship.get(rel_id, []),
-                        "strength": strength,
-                        "directed": directed
-                    })
-            if not level_items:
-                break
-            result[d] = level_items
-            frontier = next_frontier
+            for rel_id, v, directed in zip(
+                self.edge_rel[pos].tolist(),
+                nbrs.tolist(),
+                self._directed(self.weights[pos]).tolist(),
+            ):
+                nbr_name = self.node_name[v]
+                nbr_ent_id = self.entity_name_to_id.get(nbr_name)
+                level_items.append(_FrozenDict({
+                    "entity_name": nbr_name,
+                    "entity_id": nbr_ent_id,
+                    "relationship_id": rel_id,
+                    "entity_claims": tuple(self.claims_for_entity.get(nbr_ent_id, ())),
+                    "relationship_claims": tuple(self.claims_for_relationship.get(rel_id, ())),
+                    "strength": self.relationships[rel_id].strength,
+                    "directed": directed
+                }))
+            result[d] = tuple(level_items)
+
+        return _FrozenDict(result)
 
+    def neighbours_batch(self, names: List[str], depth: int = 1, max_workers: Optional[int] = None) -> list:
+        """neighbours() for each name, run concurrently; results come back in input order."""
+        self._adj_lookup() # build adjacency up front so workers don't race the lazy init
+        workers = max_workers or min(len(names), os.cpu_count() or 1)
+        if workers <= 1:
+            return [self.neighbours(name, depth) for name in names]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(lambda name: self.neighbours(name, depth), names))
+
+    def multi_bfs(self, sources: List[str], depth: int = 1) -> Dict[str, set]:
+        """
+        Names within `depth` hops of each source (source itself excluded), keyed by the given name.
+        Sources run 64 at a time as bit lanes, so edges are scanned once per level per group.
+        """
+        indptr, indices = self._adj_lookup()
+        result: Dict[str, set] = {name: set() for name in sources}
+        known = [(name, self.node_id.get(self._resolve(name))) for name in result]
+        known = [(name, node) for name, node in known if node is not None]
+        for i in range(0, len(known), 64):
+            group = known[i : i + 64]
+            starts = np.array([node for _, node in group], dtype=np.int64)
+            visited = _multi_bfs_lanes(indptr, indices, starts, depth)
+            for lane, (name, node) in enumerate(group):
+                reached = np.flatnonzero(visited & np.uint64(1 << lane))
+                result[name] = {self.node_name[v] for v in reached.tolist() if v != node}
         return result
 
+    def dfs(self, entity_name: str, max_depth: int = 2) -> List[str]:
+        """Names reachable within max_depth hops, in depth-first preorder (starting entity first)."""
+        indptr, indices = self._adj_lookup()
+        start = self.node_id.get(self._resolve(entity_name))
+        if start is None:
+            return []  # unknown node
+        return [self.node_name[u] for u in _dfs_order(indptr, indices, start, max_depth)]
+
+    def walk(self, entity_name: str, depth: int = 2) -> List[Tuple[str, float]]:
+        """
+        Entities within depth hops ranked by their strongest path from entity_name
+        (product of relationship strengths along it), best first.
+        """
+        indptr, indices = self._adj_lookup()
+        start = self.node_id.get(self._resolve(entity_name))
+        if start is None:
+            return []  # unknown node
+        scores = _walk_scores(indptr, indices, self._strength(self.weights), start, depth)
+        scores[start] = -np.inf
+        order = np.argsort(-scores, kind="stable")
+        order = order[: int(np.isfinite(scores).sum())]
+        return [(self.node_name[u], float(scores[u])) for u in order.tolist()]
+
     # shortest_path uses relationship/adjacency as loaded (BFS)
     def shortest_path(self, src_name, tgt_name):
-        src = self.index.resolve_alias(src_name)
-        tgt = self.index.resolve_alias(tgt_name)
+        src = self._resolve(src_name)
+        tgt = self._resolve(tgt_name)
         if src == tgt:
             return []
+        self._adj_lookup()
+        s, t = self.node_id.get(src), self.node_id.get(tgt)
+        if s is None or t is None:
+            return None
 
-        q = deque([(src, None)])  # (node, rel_id_used)
-        parent = {src: (None, None)}  # node -> (parent_node, rel_id)
-
-        while q:
-            node, rel_used = q.popleft()
+        # bidirectional BFS: grow whichever side has the smaller frontier by one full level
+        # until they touch. fwd[v] / bwd[v] = forward-CSR position of the edge that reached v
+        # from s / that leads from v towards t (-1 = not reached).
+        n = len(self.node_name)
+        fwd = np.full(n, -1, dtype=np.int64)
+        bwd = np.full(n, -1, dtype=np.int64)
+        seen_f = np.zeros(n, dtype=np.bool_)
+        seen_b = np.zeros(n, dtype=np.bool_)
+        seen_f[s] = seen_b[t] = True
+        front_f = np.array([s], dtype=np.int64)
+        front_b = np.array([t], dtype=np.int64)
 
-            for (rel_id, nbr, _, _) in self.adj.get(node, []):
-                if nbr not in parent:
-                    parent[nbr] = (node, rel_id)
+        while len(front_f) and len(front_b):
+            forward = len(front_f) <= len(front_b)
+            if forward:
+                pos = _frontier_edges(self.indptr, front_f)
+                nodes, edges, seen, parents, other = self.indices[pos], pos, seen_f, fwd, seen_b
+            else:
+                pos = _frontier_edges(self.rindptr, front_b)
+                nodes, edges, seen, parents, other = self.rindices[pos], self.redge[pos], seen_b, bwd, seen_f
+            fresh = ~seen[nodes]
+            nodes, edges = nodes[fresh], edges[fresh]
+            _, first = np.unique(nodes, return_index=True)
+            first.sort()
+            nodes, edges = nodes[first].astype(np.int64), edges[first]
+            seen[nodes] = True
+            parents[nodes] = edges
 
-                    if nbr == tgt:
-                        # reconstruct path with relationship IDs
-                        path = []
-                        cur = tgt
-                        while cur != src:
-                            pnode, prel = parent[cur]
-                            path.append((pnode, cur, prel))
-                            cur = pnode
-                        return list(reversed(path))
+            # every meeting node found in one level gives the same (shortest) length
+            meet = nodes[other[nodes]]
+            if len(meet):
+                m = int(meet[0])
+                return self._path_from_parents(fwd, s, m) + self._path_to_target(bwd, m, t)
+            if forward:
+                front_f = nodes
+            else:
+                front_b = nodes
+        return None
 
-                    q.append((nbr, rel_id))
+    def _path_to_target(self, bwd: np.ndarray, m: int, t: int) -> List[Tuple[str, str, int]]:
+        """Follow backward-search parents from m forward to t."""
+        path = []
+        cur = m
+        while cur != t:
+            e = int(bwd[cur])
+            nxt = int(self.indices[e])
+            path.append((self.node_name[cur], self.node_name[nxt], int(self.edge_rel[e])))
+            cur = nxt
+        return path
 
-        return None
\ No newline at end of file
+    def _path_from_parents(self, parent_edge: np.ndarray, s: int, t: int) -> List[Tuple[str, str, int]]:
+        """Walk parent edges back from t to s: [(source_name, target_name, relationship_id), ...]"""
+        path = []
+        cur = t
+        while cur != s:
+            e = int(parent_edge[cur])
+            u = int(np.searchsorted(self.indptr, e, side="right")) - 1 # edge e belongs to node u
+            path.append((self.node_name[u], self.node_name[cur], int(self.edge_rel[e])))
+            cur = u
+        return list(reversed(path))
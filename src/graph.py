@@ -20,11 +20,18 @@ from ._schemas import (
 
 if TYPE_CHECKING:
     from .state import GraphIndex
+    from .fastquery import FastQueryEngine
 
 
 class Relationship:
     """Lazy-loading relationship representation"""
-    def __init__(self, src: str, tgt: str, strength: Optional[float], state: "GraphIndex", directed: bool = False):
+    def __init__(self,
+        src: str, tgt: str,
+        strength: Optional[float],
+        state: "GraphIndex",
+        directed: bool = False,
+        engine: Optional["FastQueryEngine"] = None
+    ):
         """
         Load relationship from DB. Raises RelationshipNotFoundError if doesn't exist.
         
@@ -34,19 +41,35 @@ class Relationship:
             directed: True => require directed src→tgt;
                       False => require undirected {src, tgt} (either DB order).
             state: GraphIndex instance.
+            engine: optional FastQueryEngine; if given, aliases and the match
+                    come from its in-memory maps instead of the DB.
         """
         self._state = state 
         self.input_source_name = src
         self.input_target_name = tgt
 
-        self.canonical_source_name = self._state.resolve_alias(src)
-        self.canonical_target_name = self._state.resolve_alias(tgt)
+        resolve = engine._resolve if engine is not None else self._state.resolve_alias
+        self.canonical_source_name = resolve(src)
+        self.canonical_target_name = resolve(tgt)
         if self.canonical_source_name == self.canonical_target_name:
             raise RelationshipCollisionError(src, tgt)
         
         found = None
 
-        if directed:
+        if engine is not None:
+            # one lookup into the engine's endpoint index
+            if directed:
+                key = ((self.canonical_source_name, self.canonical_target_name), True)
+            else:
+                key = (frozenset((self.canonical_source_name, self.canonical_target_name)), False)
+            found = engine.rel_by_endpoints.get(key)
+            if found is None:
+                # same error the DB path gives for an unknown endpoint
+                ends = [self.canonical_source_name] if directed else [self.canonical_source_name, self.canonical_target_name]
+                for name in ends:
+                    if name not in engine.entity_name_to_id:
+                        raise EntityNotFoundError(name)
+        elif directed:
             # exact directed match: src->tgt only
             for r in self._state.load_relationships(self.canonical_source_name, min_strength=None, directed=True):
                 if r.directed and r.source_name == self.canonical_source_name and r.target_name == self.canonical_target_name:
@@ -78,12 +101,31 @@ class Relationship:
 
         self.directed = found.directed
         self.strength = found.strength
+        self._hash = self._endpoint_hash()
 
         self._source_entity = None
         self._target_entity = None
         self._claims = None
 
 
+    @classmethod
+    def from_record(cls, rec: RelationshipRecord, engine: "FastQueryEngine") -> Relationship:
+        """Build from an already-loaded record, skipping the DB search in __init__."""
+        self = cls.__new__(cls)
+        self._state = engine.index
+        self.input_source_name = rec.source_name
+        self.input_target_name = rec.target_name
+        self.canonical_source_name = engine._resolve(rec.source_name)
+        self.canonical_target_name = engine._resolve(rec.target_name)
+        self.directed = rec.directed
+        self.strength = rec.strength
+        self._hash = self._endpoint_hash()
+        self._source_entity = None
+        self._target_entity = None
+        self._claims = None
+        return self
+
+
     @property
     def source(self) -> Entity:
         if self._source_entity is None:
@@ -128,10 +170,15 @@ class Relationship:
             )
 
 
-    def __hash__(self):
+    def _endpoint_hash(self) -> int:
         if self.directed:
             return hash((self.canonical_source_name, self.canonical_target_name))
-        return hash(frozenset([self.canonical_source_name, self.canonical_target_name]))
+        # XOR is order-invariant, like __eq__, and needs no frozenset per call
+        return hash(self.canonical_source_name) ^ hash(self.canonical_target_name)
+
+
+    def __hash__(self):
+        return self._hash
 
 
 class Entity:
@@ -158,6 +205,21 @@ class Entity:
         self._claims = None
 
 
+    @classmethod
+    def from_name(cls, name: str, engine: "FastQueryEngine") -> Entity:
+        """Like Entity(name, state) but resolved/checked against the engine's in-memory maps."""
+        self = cls.__new__(cls)
+        self._state = engine.index
+        self.input_name = name
+        self.canonical_name = engine._resolve(name)
+        if self.canonical_name not in engine.entity_name_to_id:
+            raise EntityNotFoundError(name)
+        self.name = self.canonical_name
+        self._aliases = None
+        self._claims = None
+        return self
+
+
     @property
     def aliases(self) -> list[str]:
         if self._aliases is None:
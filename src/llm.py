@@ -8,9 +8,10 @@ TODO: add logging of every call (to .nexus)
 
 from __future__ import annotations
 
-from openai import OpenAI, AsyncOpenAI
+from openai import OpenAI, AsyncOpenAI, RateLimitError, APITimeoutError
 from typing import Literal, Optional
 from pathlib import Path
+from contextlib import asynccontextmanager, nullcontext
 import time, asyncio
 
 from ..config import log
@@ -19,13 +20,84 @@ class _BaseLLM:
     def __init__(self, system: Optional[list[dict]] = None):
         self.system = system or []
 
-    def set_system(self, content: str) -> None:
-        self.system = [{"role": "system", "content": content}]
-
-    def _guard_system(self) -> list[dict]:
-        if not self.system:
+    def set_system(self, content: str, cache_control: Optional[dict] = None) -> None:
+        self.system = self.system_message(content, cache_control)
+
+    @staticmethod
+    def system_message(content: str, cache_control: Optional[dict] = None) -> list[dict]:
+        """
+        Build a system message list. cache_control (e.g. {"type": "ephemeral"}) marks the
+        prompt as a cacheable prefix for Anthropic-compatible backends; OpenAI caches
+        long (>=1024 token) prefixes automatically and needs no marker.
+        """
+        if cache_control:
+            content = [{"type": "text", "text": content, "cache_control": cache_control}]
+        return [{"role": "system", "content": content}]
+
+    def _guard_system(self, system: Optional[list[dict]] = None) -> list[dict]:
+        system = system or self.system
+        if not system:
             raise ValueError("System prompt is not set.")
-        return self.system
+        return system
+
+
+class AdaptiveSemaphore:
+    """
+    AIMD concurrency limit for LLM calls: one extra slot after `limit` clean calls,
+    halved on a rate-limit / timeout. Always stays within [1, max_limit].
+    """
+    BACKOFF_ERRORS = (RateLimitError, APITimeoutError, asyncio.TimeoutError)
+
+    def __init__(self, initial: int, max_limit: int):
+        self.max_limit = max(1, max_limit)
+        self.limit = min(max(1, initial), self.max_limit)
+        self.in_flight = 0
+        self.latency_ema: Optional[float] = None
+        self._successes = 0
+        self._epoch = 0 # bumped on every decrease, so one burst of 429s only halves once
+        self._cond: Optional[asyncio.Condition] = None
+        self._loop = None
+
+    def _condition(self) -> asyncio.Condition:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop: # asyncio.run() makes a fresh loop per build
+            self._cond, self._loop, self.in_flight = asyncio.Condition(), loop, 0
+        return self._cond
+
+    @asynccontextmanager
+    async def slot(self):
+        cond = self._condition()
+        async with cond:
+            await cond.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+        epoch, start = self._epoch, time.monotonic()
+        try:
+            yield
+        except self.BACKOFF_ERRORS:
+            if epoch == self._epoch:
+                self._decrease()
+            raise
+        else:
+            self._increase(time.monotonic() - start)
+        finally:
+            async with cond:
+                self.in_flight -= 1
+                cond.notify_all()
+
+    def _increase(self, latency: float):
+        self.latency_ema = latency if self.latency_ema is None else 0.8 * self.latency_ema + 0.2 * latency
+        self._successes += 1
+        if self._successes >= self.limit and self.limit < self.max_limit:
+            self.limit += 1
+            self._successes = 0
+            log.debug("LLM concurrency raised to %s (latency EMA %.2fs)", self.limit, self.latency_ema)
+
+    def _decrease(self):
+        self._epoch += 1
+        self._successes = 0
+        self.limit = max(1, self.limit // 2)
+        log.warning("LLM rate-limited: concurrency lowered to %s (latency EMA %s)", self.limit,
+            f"{self.latency_ema:.2f}s" if self.latency_ema is not None else "n/a")
 
 
 class SyncLLM(_BaseLLM):
@@ -57,8 +129,8 @@ class SyncLLM(_BaseLLM):
         self.retries = retries
 
 
-    def run(self, prompt: str) -> str:
-        messages = self._guard_system() + [{"role": "user", "content": prompt}]
+    def run(self, prompt: str, system: Optional[list[dict]] = None) -> str:
+        messages = self._guard_system(system) + [{"role": "user", "content": prompt}]
         for attempt in range(self.retries + 1):
             try:
                 response = self.client.chat.completions.create(
@@ -68,7 +140,7 @@ class SyncLLM(_BaseLLM):
                 output = response.choices[0].message.content.strip()
                 return output
             except Exception as exc:
-                if attempt < self.retries - 1:
+                if attempt < self.retries:
                     log.warning("Encountered SyncLLM exception during attempt %s: [%s]: %s",
                         attempt, type(exc).__name__, exc)
                     wait_time = min(2 ** attempt, 30)
@@ -87,9 +159,11 @@ class AsyncLLM(_BaseLLM):
         url: Optional[str],
         log_path: Optional[Path] = None, # | TODO
         retries: int = 0,
+        limiter: Optional[AdaptiveSemaphore] = None,
     ):
         super().__init__()
         self.backend = backend
+        self.limiter = limiter
         if self.backend == "openai":
             try:
                 self.client = AsyncOpenAI(api_key=api_key)
@@ -106,18 +180,49 @@ class AsyncLLM(_BaseLLM):
         self.retries = retries
 
 
-    async def run(self, prompt: str) -> str:
-        messages = self._guard_system() + [{"role": "user", "content": prompt}]
+    async def run(self, prompt: str, system: Optional[list[dict]] = None) -> str:
+        messages = self._guard_system(system) + [{"role": "user", "content": prompt}]
         for attempt in range(self.retries + 1):
             try:
-                response = await self.client.chat.completions.create(
-                    model=self.model,
-                    messages=messages
-                )
+                async with (self.limiter.slot() if self.limiter else nullcontext()):
+                    response = await self.client.chat.completions.create(
+                        model=self.model,
+                        messages=messages
+                    )
                 output = response.choices[0].message.content.strip()
                 return output
             except Exception as exc:
-                if attempt < self.retries - 1:
+                if attempt < self.retries:
+                    log.warning("Encountered AsyncLLM exception during attempt %s: [%s]: %s",
+                        attempt, type(exc).__name__, exc)
+                    wait_time = min(2 ** attempt, 30)
+                    await asyncio.sleep(wait_time)
+                else:
+                    raise exc
+
+
+    async def run_stream(self, prompt: str, system: Optional[list[dict]] = None):
+        """
+        Like run(), but yields the response text piece by piece as it streams in.
+        Only retries failures that happen before the first piece arrives.
+        """
+        messages = self._guard_system(system) + [{"role": "user", "content": prompt}]
+        for attempt in range(self.retries + 1):
+            started = False
+            try:
+                async with (self.limiter.slot() if self.limiter else nullcontext()):
+                    stream = await self.client.chat.completions.create(
+                        model=self.model,
+                        messages=messages,
+                        stream=True,
+                    )
+                    async for event in stream:
+                        if event.choices and event.choices[0].delta.content:
+                            started = True
+                            yield event.choices[0].delta.content
+                return
+            except Exception as exc:
+                if not started and attempt < self.retries:
                     log.warning("Encountered AsyncLLM exception during attempt %s: [%s]: %s",
                         attempt, type(exc).__name__, exc)
                     wait_time = min(2 ** attempt, 30)
@@ -2,5 +2,6 @@ from .meta_index import MetaIndex
 from .vector_index import VectorIndex
 from .graph_index import GraphIndex
 from .cluster_index import ClusterIndex
+from .response_cache import ResponseCache
 
-__all__ = ["MetaIndex", "VectorIndex", "GraphIndex", "ClusterIndex"]
\ No newline at end of file
+__all__ = ["MetaIndex", "VectorIndex", "GraphIndex", "ClusterIndex", "ResponseCache"]
\ No newline at end of file
@@ -38,6 +38,8 @@ class ClusterIndex:
         """
         con = sqlite3.connect(self.index_path)
         con.execute("PRAGMA journal_mode=WAL;")
+        con.execute("PRAGMA synchronous=NORMAL;") # safe under WAL; see GraphIndex._connect
+        con.execute("PRAGMA temp_store=MEMORY;")
         con.execute("PRAGMA foreign_keys=ON;")
         con.execute("PRAGMA busy_timeout=5000;")
         con.row_factory = sqlite3.Row
@@ -2,9 +2,14 @@ from __future__ import annotations
 
 from contextlib import contextmanager
 from pathlib import Path
+import json
+import queue
 import sqlite3
+import threading
+import time
 from datetime import datetime, timezone
-from typing import Optional, Literal
+from itertools import islice
+from typing import Iterable, Iterator, Optional, Literal
 
 from ...config import log
 from .._schemas import (
@@ -18,6 +23,194 @@ from .._schemas import (
 )
 
 
+_BULK_CHUNK = 900 # bound parameters per multi-row statement (SQLite's floor is 999)
+_ALIAS_CACHE_SIZE = 10000 # entries in the shared resolve_alias() cache
+_ALIAS_CACHE_RECHECK = 1.0 # seconds between PRAGMA data_version checks of the shared cache
+
+# statements used on hot paths; kept as module constants so the text is identical on
+# every call and the per-connection statement cache (cached_statements) reuses them
+_SQL_ENTITY_ID = "SELECT id FROM entities WHERE name = ?;"
+_SQL_ENTITY_NAME = "SELECT name FROM entities WHERE id = ?;"
+_SQL_ALIAS_ENTITY_ID = "SELECT entity_id FROM aliases WHERE alias = ?;"
+_SQL_ALIASES_OF_NAME = """
+    SELECT a.alias FROM aliases a JOIN entities e ON e.id = a.entity_id
+    WHERE e.name = ? ORDER BY a.id;
+"""
+# canonical id + alias-entity ids for one canonical name, as a subquery (binds the name twice)
+_SQL_FAMILY_IDS = (
+    "SELECT id FROM entities WHERE name = ? "
+    "UNION ALL "
+    "SELECT e2.id FROM aliases a "
+    "JOIN entities e1 ON e1.id = a.entity_id JOIN entities e2 ON e2.name = a.alias "
+    "WHERE e1.name = ?"
+)
+_SQL_EXPAND_IDS = """
+    SELECT id FROM entities WHERE name = :name
+    UNION ALL
+    SELECT e2.id FROM aliases a
+    JOIN entities e1 ON e1.id = a.entity_id
+    JOIN entities e2 ON e2.name = a.alias
+    WHERE e1.name = :name;
+"""
+_SQL_DELETE_ENTITY = "DELETE FROM entities WHERE id = ?;"
+_SQL_RESOLVE_ALIAS = """
+    SELECT COALESCE(e2.name, e1.name)
+    FROM (SELECT ? AS n) x
+    LEFT JOIN aliases a ON a.alias = x.n
+    LEFT JOIN entities e2 ON e2.id = a.entity_id
+    LEFT JOIN entities e1 ON e1.name = x.n;
+"""
+# entity id + the alias's mapping row and owner name (NULLs if unmapped); no row if no entity
+_SQL_ALIAS_MAPPING = """
+    SELECT e.id, a.id, a.entity_id, owner.name
+    FROM entities e
+    LEFT JOIN aliases a ON a.alias = :alias
+    LEFT JOIN entities owner ON owner.id = a.entity_id
+    WHERE e.name = :entity;
+"""
+_SQL_UPSERT_ENTITY = """
+    INSERT INTO entities (name, entity_type, date_added)
+    VALUES (?, ?, CURRENT_TIMESTAMP)
+    ON CONFLICT(name)
+    DO UPDATE SET entity_type = COALESCE(excluded.entity_type, entities.entity_type)
+    RETURNING id;
+"""
+_SQL_UPSERT_RELATIONSHIP = """
+    INSERT INTO relationships (source_id, target_id, strength, directed, date_added)
+    VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+    ON CONFLICT(source_id, target_id, directed)
+    DO UPDATE SET strength = excluded.strength
+    RETURNING id;
+"""
+_SQL_INSERT_CLAIM = """
+    INSERT INTO claims (entity_id, relationship_id, content, source, claim_date, date_added)
+    VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+    RETURNING id;
+"""
+# executemany can't return rows, so the bulk variants have no RETURNING
+_SQL_UPSERT_RELATIONSHIP_MANY = """
+    INSERT INTO relationships (source_id, target_id, strength, directed, date_added)
+    VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+    ON CONFLICT(source_id, target_id, directed)
+    DO UPDATE SET strength = excluded.strength;
+"""
+_SQL_INSERT_CLAIM_MANY = """
+    INSERT INTO claims (entity_id, relationship_id, content, source, claim_date, date_added)
+    VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP);
+"""
+_SQL_UPSERT_ALIAS = """
+    INSERT INTO aliases (entity_id, alias, date_added)
+    VALUES (?, ?, CURRENT_TIMESTAMP)
+    ON CONFLICT(alias) DO UPDATE SET entity_id = aliases.entity_id
+    RETURNING id, entity_id;
+"""
+_SQL_ALIAS_RELS = """
+    CREATE TEMP TABLE alias_rels AS
+    SELECT m.id, m.ns, m.nt, m.directed, r.id AS existing_id
+    FROM (
+        SELECT id,
+            CASE WHEN directed = 0 THEN MIN(s, t) ELSE s END AS ns,
+            CASE WHEN directed = 0 THEN MAX(s, t) ELSE t END AS nt,
+            directed
+        FROM (
+            SELECT id,
+                CASE WHEN source_id = :alias THEN :canonical ELSE source_id END AS s,
+                CASE WHEN target_id = :alias THEN :canonical ELSE target_id END AS t,
+                CASE WHEN directed THEN 1 ELSE 0 END AS directed
+            FROM relationships
+            WHERE source_id = :alias OR target_id = :alias
+        )
+    ) m
+    LEFT JOIN relationships r
+        ON r.source_id = m.ns AND r.target_id = m.nt AND r.directed = m.directed;
+"""
+# both families (canonical + alias-entities) expanded in the same statement; a missing
+# entity just gives an empty family
+_SQL_HAS_RELATIONSHIP_BETWEEN = """
+    WITH fam_a AS (
+        SELECT id FROM entities WHERE name = :a
+        UNION ALL
+        SELECT e2.id FROM aliases a
+        JOIN entities e1 ON e1.id = a.entity_id JOIN entities e2 ON e2.name = a.alias
+        WHERE e1.name = :a
+    ),
+    fam_b AS (
+        SELECT id FROM entities WHERE name = :b
+        UNION ALL
+        SELECT e2.id FROM aliases a
+        JOIN entities e1 ON e1.id = a.entity_id JOIN entities e2 ON e2.name = a.alias
+        WHERE e1.name = :b
+    )
+    SELECT EXISTS(
+        SELECT 1 FROM relationships
+        WHERE (source_id IN fam_a AND target_id IN fam_b)
+           OR (source_id IN fam_b AND target_id IN fam_a)
+    );
+"""
+# claims come back newest claim_date first, undated last, then in insertion order
+_SQL_ENTITY_AND_ALIAS_CLAIMS = """
+    WITH canon AS (SELECT id FROM entities WHERE name = ?),
+    all_ids AS (
+        SELECT id FROM canon
+        UNION
+        SELECT e.id FROM aliases a JOIN entities e ON e.name = a.alias
+        WHERE a.entity_id IN canon
+    )
+    SELECT content, source, date_added, claim_date
+    FROM claims
+    WHERE entity_id IN all_ids
+    ORDER BY COALESCE(claim_date, '') = '', claim_date DESC, id;
+"""
+# claims go away with their entity / relationship, so deletes only touch the parent row
+_SQL_CREATE_CLAIMS = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        id INTEGER PRIMARY KEY,
+        entity_id INTEGER,
+        relationship_id INTEGER,
+        content TEXT NOT NULL,
+        source TEXT,
+        date_added TIMESTAMP DEFAULT NULL,
+        claim_date TEXT,
+        tags TEXT,
+        CHECK ((entity_id IS NULL) <> (relationship_id IS NULL)),
+        FOREIGN KEY(entity_id) REFERENCES entities(id) ON DELETE CASCADE,
+        FOREIGN KEY(relationship_id) REFERENCES relationships(id) ON DELETE CASCADE
+    );
+"""
+_SQL_ENTITY_CLAIMS = """
+    SELECT content, source, date_added, claim_date
+    FROM claims
+    WHERE entity_id = ?;
+"""
+
+
+def _chunked(items: Iterable, n: int) -> Iterator[list]:
+    """Yield successive lists of at most n items (keeps multi-row statements under the bind limit)."""
+    it = iter(items)
+    while chunk := list(islice(it, n)):
+        yield chunk
+
+
+def _padded(chunk: list, n: int) -> list:
+    """
+    Pad a _chunked() chunk (by repeating its last item) to the next power of two, capped at n.
+    Multi-row statements then come in a handful of sizes, so their SQL text repeats and hits
+    the connection's statement cache instead of being re-parsed for every odd length.
+    Only for statements where a repeated row is harmless.
+    """
+    size = 1
+    while size < len(chunk):
+        size *= 2
+    return chunk + chunk[-1:] * (min(size, n) - len(chunk))
+
+
+def _named(con: sqlite3.Connection) -> sqlite3.Cursor:
+    """Cursor on con whose rows are sqlite3.Row (access by column name)."""
+    cur = con.cursor()
+    cur.row_factory = sqlite3.Row
+    return cur
+
+
 def debug_only(func):
     """Marks a function as debug/internal use only"""
     func.__debug_only__ = True
@@ -27,33 +220,221 @@ def debug_only(func):
 class GraphIndex:
     """Graph Index handler"""
 
-    def __init__(self, index_path: str | Path):
+    def __init__(self, index_path: str | Path, read_pool_size: int = 4):
         self.index_path = Path(index_path)
+        # one long-lived writer (serialized by _write_lock) + a pool of readers;
+        # under WAL readers run alongside the writer
+        self._write_lock = threading.RLock()
+        self._write_conn: Optional[sqlite3.Connection] = None
+        self._read_pool: queue.Queue[sqlite3.Connection] = queue.Queue()
+        self._read_pool_size = read_pool_size
+        self._local = threading.local() # per-thread write depth + resolve cache, see _write()
+        # committed alias -> canonical resolutions, shared by all threads (see resolve_alias);
+        # dropped by our own alias commits, and by commits from other connections or processes
+        # once _check_data_version() notices them (at most _ALIAS_CACHE_RECHECK seconds later)
+        self._alias_cache: dict[str, str] = {}
+        self._alias_cache_gen = 0 # bumped on every drop, so in-flight lookups don't re-add stale names
+        self._alias_cache_version: Optional[int] = None
+        self._alias_cache_checked = 0.0 # time.monotonic() of the last data_version check
+        self._version_lock = threading.Lock()
+        self._version_conn: Optional[sqlite3.Connection] = None # only runs PRAGMA data_version
         self._initialize()
 
 
-    @contextmanager
-    def _conn(self):
+    def _connect(self, **kwargs) -> sqlite3.Connection:
         """
-        Helper to open a SQLite connection with row access by column name.
+        Open a connection with the index's pragmas (WAL, synchronous=NORMAL, 256 MB mmap,
+        64 MB page cache, in-memory temp tables).
+
+        NOTE: under WAL, synchronous=NORMAL skips the fsync on each commit. A power loss or
+        OS crash can drop the last committed transaction(s), but the database stays consistent.
         """
-        con = sqlite3.connect(self.index_path)
+        # connections are long-lived and handed between threads, so pragmas run once here
+        con = sqlite3.connect(self.index_path, check_same_thread=False, cached_statements=256, **kwargs)
         con.execute("PRAGMA journal_mode=WAL;")
+        con.execute("PRAGMA synchronous=NORMAL;")
         con.execute("PRAGMA foreign_keys=ON;")
         con.execute("PRAGMA busy_timeout=5000;")
-        con.row_factory = sqlite3.Row
+        con.execute("PRAGMA temp_store=MEMORY;")
+        con.execute("PRAGMA mmap_size=268435456;")
+        con.execute("PRAGMA cache_size=-65536;")
+        # plain tuple rows: most lookups only read row[0]; the few that read columns by
+        # name go through _named()
+        return con
+
+
+    def close(self) -> None:
+        """Close the writer and every pooled reader. The index reconnects if used again."""
+        with self._write_lock:
+            if self._write_conn is not None:
+                self._write_conn.execute("PRAGMA optimize;") # re-ANALYZE tables that changed a lot
+                self._write_conn.close()
+                self._write_conn = None
+        with self._version_lock:
+            if self._version_conn is not None:
+                self._version_conn.close()
+                self._version_conn = None
+        while True:
+            try:
+                self._read_pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+    @contextmanager
+    def bulk(self):
+        """
+        Run every GraphIndex call in this block (on this thread) in one transaction.
+
+        Each call still gets its own savepoint, so a call that raises is rolled back
+        on its own and the rest of the batch commits as usual. Nested bulk() is a no-op.
+        """
+        outermost = not getattr(self._local, "depth", 0)
+        with self._write() as con:
+            yield
+            if outermost:
+                self._refresh_stats(con)
+
+
+    @contextmanager
+    def snapshot(self):
+        """
+        Run every GraphIndex read in this block (on this thread) in one read transaction,
+        so they all see the same committed state. Writes in the block go through the writer
+        as usual. Nested snapshot() (or one inside a write) is a no-op.
+        """
+        if getattr(self._local, "depth", 0) or getattr(self._local, "read_con", None) is not None:
+            yield
+            return
+        with self._read() as con:
+            con.execute("BEGIN;")
+            self._local.read_con = con
+            try:
+                yield
+            finally:
+                self._local.read_con = None
+                con.execute("COMMIT;") # read-only, just ends the transaction
+
+
+    @contextmanager
+    def _write(self):
+        """
+        Yield the shared write connection inside a transaction, holding the write lock.
+        Nested use (another write call, or anything inside bulk()) runs under a savepoint
+        of the outer transaction instead.
+
+        The outermost call also owns a resolve_alias() cache that lives for the transaction;
+        anything that changes the aliases table must call _forget_resolved().
+        """
+        with self._write_lock:
+            if self._write_conn is None:
+                self._write_conn = self._connect(isolation_level=None) # we manage BEGIN/COMMIT ourselves
+            con = self._write_conn
+            depth = getattr(self._local, "depth", 0)
+            self._local.depth = depth + 1
+            try:
+                if depth:
+                    alias_writes = self._local.alias_writes
+                    aliases_dirty = getattr(self._local, "aliases_dirty", False)
+                    con.execute("SAVEPOINT nexus_op;")
+                    try:
+                        yield con
+                    except BaseException:
+                        con.execute("ROLLBACK TO nexus_op;")
+                        con.execute("RELEASE nexus_op;")
+                        if self._local.alias_writes != alias_writes:
+                            # names may have been resolved against the rolled-back aliases
+                            self._local.resolved.clear()
+                            self._local.aliases_dirty = aliases_dirty
+                        raise
+                    con.execute("RELEASE nexus_op;")
+                else:
+                    # take the write lock up front: a deferred BEGIN would start as a reader
+                    # and upgrade mid-transaction, which is what hits SQLITE_BUSY under WAL
+                    con.execute("BEGIN IMMEDIATE;")
+                    self._local.resolved = {}
+                    self._local.alias_writes = 0
+                    try:
+                        yield con
+                    except BaseException:
+                        con.execute("ROLLBACK;")
+                        raise
+                    con.execute("COMMIT;")
+            finally:
+                self._local.depth = depth
+                if not depth:
+                    self._local.resolved = None
+                    if getattr(self._local, "aliases_dirty", False):
+                        # only now are the alias changes visible to other threads' readers
+                        self._local.aliases_dirty = False
+                        self._drop_alias_cache()
+
+
+    def _forget_resolved(self) -> None:
+        """
+        Drop this transaction's resolve_alias() cache (after any change to aliases), and
+        mark the shared cache to be dropped once the transaction ends.
+        """
+        resolved = getattr(self._local, "resolved", None)
+        if resolved:
+            resolved.clear()
+        self._local.alias_writes = getattr(self._local, "alias_writes", 0) + 1
+        self._local.aliases_dirty = True
+
+
+    def _drop_alias_cache(self) -> None:
+        self._alias_cache_gen += 1
+        self._alias_cache = {}
+
+
+    def _check_data_version(self) -> None:
+        """
+        Drop the shared alias cache if the database changed since the last check. PRAGMA
+        data_version (on a connection kept just for it) moves whenever another connection
+        commits, including this index's writer and other processes.
+        """
+        if not self._version_lock.acquire(blocking=False):
+            return # another thread is already checking
+        try:
+            self._alias_cache_checked = time.monotonic()
+            if self._version_conn is None:
+                self._version_conn = self._connect(isolation_level=None)
+            version = self._version_conn.execute("PRAGMA data_version;").fetchone()[0]
+            if version != self._alias_cache_version:
+                self._alias_cache_version = version
+                self._drop_alias_cache()
+        finally:
+            self._version_lock.release()
+
+
+    @contextmanager
+    def _read(self):
+        """
+        Yield a pooled read connection. A thread that is inside _write() reads through the
+        writer instead, so it sees its own uncommitted changes.
+        """
+        if getattr(self._local, "depth", 0):
+            yield self._write_conn
+            return
+        read_con = getattr(self._local, "read_con", None)
+        if read_con is not None: # inside snapshot()
+            yield read_con
+            return
+        try:
+            con = self._read_pool.get_nowait()
+        except queue.Empty:
+            con = self._connect(isolation_level=None)
         try:
             yield con
-            con.commit()
-        except Exception:
-            con.rollback()
-            raise
         finally:
-            con.close()
+            if self._read_pool.qsize() < self._read_pool_size:
+                self._read_pool.put(con)
+            else:
+                con.close()
 
 
     def _initialize(self) -> None:
-        with self._conn() as con:
+        with self._write() as con:
             con.execute("""
                 CREATE TABLE IF NOT EXISTS entities (
                     id INTEGER PRIMARY KEY,
@@ -86,40 +467,67 @@ class GraphIndex:
                     FOREIGN KEY(entity_id) REFERENCES entities(id)
                 );
             """)
-            con.execute("""
-                CREATE TABLE IF NOT EXISTS claims (
-                    id INTEGER PRIMARY KEY,
-                    entity_id INTEGER,
-                    relationship_id INTEGER,
-                    content TEXT NOT NULL,
-                    source TEXT,
-                    date_added TIMESTAMP DEFAULT NULL,
-                    claim_date TEXT,
-                    tags TEXT,
-                    CHECK ((entity_id IS NULL) <> (relationship_id IS NULL)),
-                    FOREIGN KEY(entity_id) REFERENCES entities(id),
-                    FOREIGN KEY(relationship_id) REFERENCES relationships(id)
-                );
-            """)
+            con.execute(_SQL_CREATE_CLAIMS.format(table="claims"))
+            migrated = self._migrate_claims_cascade(con)
 
             # indexes
             con.execute("CREATE INDEX IF NOT EXISTS idx_rel_source ON relationships(source_id);")
             con.execute("CREATE INDEX IF NOT EXISTS idx_rel_target ON relationships(target_id);")
-            con.execute("CREATE INDEX IF NOT EXISTS idx_claims_entity ON claims(entity_id);")
-            con.execute("CREATE INDEX IF NOT EXISTS idx_claims_relationship ON claims(relationship_id);")
+            # (entity_id, claim_date DESC) supersedes the old entity index; a single entity's
+            # claims come off it already in load_entity_claims() order
+            con.execute("DROP INDEX IF EXISTS idx_claims_entity;")
+            con.execute("CREATE INDEX IF NOT EXISTS idx_claims_entity_date ON claims(entity_id, claim_date DESC);")
+            # (relationship_id, entity_id) supersedes the old single-column relationship index
+            con.execute("DROP INDEX IF EXISTS idx_claims_relationship;")
+            con.execute("CREATE INDEX IF NOT EXISTS idx_claims_rel_id ON claims(relationship_id, entity_id);")
+            con.execute("CREATE INDEX IF NOT EXISTS idx_aliases_entity ON aliases(entity_id, alias);")
+            # aliases.alias and entities.name are covered by their UNIQUE constraints
 
+            if migrated: # the rebuilt table and its new indexes have no planner statistics
+                con.execute("ANALYZE;")
+
+
+    def _migrate_claims_cascade(self, con) -> bool:
+        """
+        Rebuild a claims table created before its foreign keys were ON DELETE CASCADE.
+        Returns whether it did.
+        """
+        on_delete = {row[3]: row[6] for row in con.execute("PRAGMA foreign_key_list(claims);")}
+        if all(action == "CASCADE" for action in on_delete.values()):
+            return False
+        log.info("Migrating claims table to ON DELETE CASCADE")
+        # SQLite can't alter a foreign key, so copy into a fresh table and swap it in;
+        # nothing references claims, and its indexes are recreated by _initialize()
+        con.execute(_SQL_CREATE_CLAIMS.format(table="claims_new"))
+        cols = "id, entity_id, relationship_id, content, source, date_added, claim_date, tags"
+        con.execute(f"INSERT INTO claims_new ({cols}) SELECT {cols} FROM claims;")
+        con.execute("DROP TABLE claims;")
+        con.execute("ALTER TABLE claims_new RENAME TO claims;")
+        return True
+
+
+    def _refresh_stats(self, con) -> None:
+        """
+        Planner statistics, so the IN / json_each lookups pick the indexes. ANALYZE once a
+        table has more than doubled since it was last analyzed (or never was); bulk loads
+        call this on exit, and PRAGMA optimize in close() covers the rest.
+        """
+        analyzed: dict[str, int] = {}
+        if con.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1';").fetchone():
+            # the first number of each stat is the table's row count at ANALYZE time
+            for tbl, stat in con.execute("SELECT tbl, stat FROM sqlite_stat1;"):
+                analyzed[tbl] = int(stat.split()[0]) if stat else 0
+        for table in ("entities", "relationships", "claims"):
+            rows = con.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table};").fetchone()[0] # ~row count, O(log n)
+            if rows > 2 * analyzed.get(table, 0):
+                con.execute("ANALYZE;")
+                return
 
 
     def upsert_entity(self, name: str, entity_type: Optional[str]=None) -> int:
         """Insert or update an entity by name, returning its id."""
-        with self._conn() as con:
-            cur = con.execute("""
-                INSERT INTO entities (name, entity_type, date_added)
-                VALUES (?, ?, CURRENT_TIMESTAMP)
-                ON CONFLICT(name)
-                DO UPDATE SET entity_type = COALESCE(excluded.entity_type, entities.entity_type)
-                RETURNING id;
-            """, (name, entity_type))
+        with self._write() as con:
+            cur = con.execute(_SQL_UPSERT_ENTITY, (name, entity_type))
             return cur.fetchone()[0]
 
 
@@ -135,29 +543,63 @@ class GraphIndex:
         Undirected normalization: for directed=False, store the pair in
         ordered form (min_id, max_id, 0). This avoids duplicate undirected rows.
         """
-        source_canonical = self.resolve_alias(source_name)
-        target_canonical = self.resolve_alias(target_name)
-        
-        if source_canonical == target_canonical:
-            raise RelationshipCollisionError(source_name, target_name)
-    
-        source_id = self.upsert_entity(source_canonical)
-        target_id = self.upsert_entity(target_canonical)
-
-        # normalize for undirected relationships
-        source_id, target_id, directed = self._normalize_pair(source_id, target_id, directed)
-
-        with self._conn() as con:
-            cur = con.execute("""
-                INSERT INTO relationships (source_id, target_id, strength, directed, date_added)
-                VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
-                ON CONFLICT(source_id, target_id, directed)
-                DO UPDATE SET strength = excluded.strength
-                RETURNING id;
-            """, (source_id, target_id, strength, int(bool(directed))))
+        with self._write() as con:
+            source_canonical = self.resolve_alias(source_name)
+            target_canonical = self.resolve_alias(target_name)
+
+            if source_canonical == target_canonical:
+                raise RelationshipCollisionError(source_name, target_name)
+
+            source_id = self.upsert_entity(source_canonical)
+            target_id = self.upsert_entity(target_canonical)
+
+            # normalize for undirected relationships
+            source_id, target_id, directed = self._normalize_pair(source_id, target_id, directed)
+
+            cur = con.execute(_SQL_UPSERT_RELATIONSHIP, (source_id, target_id, strength, int(bool(directed))))
             return cur.fetchone()[0]
 
 
+    def upsert_relationships(self, records: Iterable[RelationshipRecord]) -> list[int]:
+        """
+        Bulk upsert_relationship(): one transaction, names resolved and entities upserted
+        a chunk at a time, relationships written with one executemany. Returns the
+        relationship ids in input order. Raises RelationshipCollisionError (and writes
+        nothing) if any record relates an entity to itself.
+        """
+        records = list(records)
+        if not records:
+            return []
+        with self._write() as con:
+            # dicts, not sets: entities get ids in first-appearance order, as with upsert_relationship()
+            endpoints = [n for r in records for n in (r.source_name, r.target_name)]
+            canonical = self._resolve_many(con, dict.fromkeys(endpoints))
+            for r in records:
+                if canonical[r.source_name] == canonical[r.target_name]:
+                    raise RelationshipCollisionError(r.source_name, r.target_name)
+            ids = self._upsert_entity_ids(con, dict.fromkeys(canonical[n] for n in endpoints))
+
+            keys = [
+                self._normalize_pair(ids[canonical[r.source_name]], ids[canonical[r.target_name]], r.directed)
+                for r in records
+            ]
+            con.executemany(_SQL_UPSERT_RELATIONSHIP_MANY, [
+                (source_id, target_id, r.strength, directed)
+                for (source_id, target_id, directed), r in zip(keys, records)
+            ])
+
+            # ids for the (source_id, target_id, directed) keys just written
+            rel_ids: dict[tuple[int, int, int], int] = {}
+            for chunk in _chunked(dict.fromkeys(keys), _BULK_CHUNK // 3):
+                chunk = _padded(chunk, _BULK_CHUNK // 3)
+                rows = con.execute(f"""
+                    SELECT source_id, target_id, directed, id FROM relationships
+                    WHERE (source_id, target_id, directed) IN (VALUES {",".join(["(?, ?, ?)"] * len(chunk))});
+                """, [v for key in chunk for v in key]).fetchall()
+                rel_ids.update({(row[0], row[1], row[2]): row[3] for row in rows})
+            return [rel_ids[key] for key in keys]
+
+
     def upsert_alias(self, entity_name: str, alias: str) -> int:
         """
         Associate an alias with an entity by name.
@@ -176,38 +618,27 @@ class GraphIndex:
                 entity_name, alias, alias,
                 message=f"Cannot self-alias '{entity_name}' to '{alias}'."
             )
-        canonical = self.resolve_alias(entity_name)
-        if entity_name != canonical:
-            msg = (
-                f"Cannot set an alias of '{entity_name}' because "
-                f"'{entity_name}' is itself an alias of '{canonical}'. "
-                f"Instead, set '{alias}' as an alias of '{canonical}'."
-            )
-            raise AliasConflictError(entity_name, canonical, alias, message=msg)
-        
-        entity_id = self.upsert_entity(entity_name)
-        
-        with self._conn() as con:
-            # check: don't upsert an alias that belongs to another entity
-            alias_is_existing_alias = con.execute(
-                "SELECT entity_id FROM aliases WHERE alias = ?;", 
-                (alias,)
-            ).fetchone() # check if alias already exists
-            if alias_is_existing_alias and alias_is_existing_alias[0] != entity_id:
-                existing_entity = con.execute(
-                    "SELECT name FROM entities WHERE id = ?;", 
-                    (alias_is_existing_alias[0],)
-                ).fetchone()[0] # get entity names for error message
-                raise AliasConflictError(alias, existing_entity, entity_name)
 
-            con.execute("""
-                INSERT INTO aliases (entity_id, alias, date_added)
-                VALUES (?, ?, CURRENT_TIMESTAMP)
-                ON CONFLICT(alias) DO NOTHING;
-            """, (entity_id, alias))
-            
-            cur = con.execute("SELECT id FROM aliases WHERE alias = ?;", (alias,))
-            return cur.fetchone()[0]
+        with self._write() as con:
+            canonical = self.resolve_alias(entity_name)
+            if entity_name != canonical:
+                msg = (
+                    f"Cannot set an alias of '{entity_name}' because "
+                    f"'{entity_name}' is itself an alias of '{canonical}'. "
+                    f"Instead, set '{alias}' as an alias of '{canonical}'."
+                )
+                raise AliasConflictError(entity_name, canonical, alias, message=msg)
+
+            entity_id = self.upsert_entity(entity_name)
+
+            # UNIQUE(alias) does the existence check: on conflict the no-op update hands back
+            # the existing row, and only a mismatch costs the name lookup for the error
+            alias_id, owner_id = con.execute(_SQL_UPSERT_ALIAS, (entity_id, alias)).fetchone()
+            if owner_id != entity_id:
+                owner_name = con.execute(_SQL_ENTITY_NAME, (owner_id,)).fetchone()[0]
+                raise AliasConflictError(alias, owner_name, entity_name)
+            self._forget_resolved()
+            return alias_id
 
 
     def upsert_claim(self,
@@ -225,142 +656,134 @@ class GraphIndex:
 
         entity_id = None
         relationship_id = None
-        
-        if entity_name:
-            entity_id = self.upsert_entity(entity_name)
-        elif relationship:
-            relationship_id = self.upsert_relationship(
-                relationship.source_name,
-                relationship.target_name,
-                relationship.strength,
-                relationship.directed
-            )
-        
-        if claim_date is None:
-            claim_date_iso8601 = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
-        else: # | TODO: kinder parsing
-            try:
-                dt = datetime.fromisoformat(claim_date)
-                if dt.tzinfo is None:
-                    dt = dt.replace(tzinfo=timezone.utc)
-                claim_date_iso8601 = dt.strftime("%Y-%m-%d %H:%M:%S")
-            except Exception: # fallback to now
-                claim_date_iso8601 = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
-        
-        with self._conn() as con:
-            cur = con.execute("""
-                INSERT INTO claims (entity_id, relationship_id, content, source, claim_date, date_added)
-                VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                RETURNING id;
-            """, (entity_id, relationship_id, content, source, claim_date_iso8601))
+        claim_date_iso8601 = self._claim_date_iso8601(claim_date)
+
+        with self._write() as con:
+            if entity_name:
+                entity_id = self.upsert_entity(entity_name)
+            elif relationship:
+                relationship_id = self.upsert_relationship(
+                    relationship.source_name,
+                    relationship.target_name,
+                    relationship.strength,
+                    relationship.directed
+                )
+
+            cur = con.execute(_SQL_INSERT_CLAIM, (entity_id, relationship_id, content, source, claim_date_iso8601))
             return cur.fetchone()[0]
 
 
+    def upsert_claims(self, records: Iterable[dict]) -> None:
+        """
+        Insert many claims in one transaction. Each record holds upsert_claim()'s keyword
+        arguments (content, source, entity_name | relationship, claim_date), plus an optional
+        entity_type for the entity (the last non-None type per name wins, as with upsert_entity()).
+        Entities and relationships are upserted in bulk, each once, then the claims go in
+        with one executemany, in record order.
+        """
+        records = list(records)
+        for rec in records:
+            if rec.get("entity_name") and rec.get("relationship"):
+                raise ValueError("Claim cannot be associated with both entity and relationship")
+            if not rec.get("entity_name") and not rec.get("relationship"):
+                raise ValueError("Claim must be associated with either entity or relationship")
+
+        with self._write() as con:
+            entity_types: dict[str, Optional[str]] = {}
+            for rec in records:
+                if rec.get("entity_name"):
+                    if rec.get("entity_type") is not None or rec["entity_name"] not in entity_types:
+                        entity_types[rec["entity_name"]] = rec.get("entity_type")
+            entity_ids = self._upsert_entity_ids(con, entity_types, entity_types)
+            rel_records = [rec["relationship"] for rec in records if rec.get("relationship")]
+            rel_ids = iter(self.upsert_relationships(rel_records))
+            now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S") # shared by undated claims
+            rows = [
+                (
+                    entity_ids[rec["entity_name"]] if rec.get("entity_name") else None,
+                    None if rec.get("entity_name") else next(rel_ids),
+                    rec["content"],
+                    rec.get("source"),
+                    self._claim_date_iso8601(rec.get("claim_date"), now),
+                )
+                for rec in records
+            ]
+            con.executemany(_SQL_INSERT_CLAIM_MANY, rows)
+
+
     def drop(self):
         """drop all data from all tables."""
-        with self._conn() as con:
+        with self._write() as con:
             con.execute("DELETE FROM claims;")
             con.execute("DELETE FROM relationships;")
             con.execute("DELETE FROM aliases;")
             con.execute("DELETE FROM entities;")
+            self._forget_resolved()
 
 
     def load_aliases(self, name: str) -> list[str]:
         """Load all aliases for an entity (resolve to canonical first)"""
         canonical = self.resolve_alias(name)
 
-        with self._conn() as con:
-            entity_row = con.execute(
-                "SELECT id FROM entities WHERE name = ?;",
-                (canonical,)
-            ).fetchone()
-            
-            if not entity_row:
+        with self._read() as con:
+            rows = con.execute(_SQL_ALIASES_OF_NAME, (canonical,)).fetchall()
+            # no rows: either no aliases or no entity; only then pay for the existence check
+            if not rows and not con.execute(_SQL_ENTITY_ID, (canonical,)).fetchone():
                 raise EntityNotFoundError(canonical)
             
-            entity_id = entity_row[0]
-            
-            rows = con.execute(
-                "SELECT alias FROM aliases WHERE entity_id = ?;",
-                (entity_id,)
-            ).fetchall()
-            
             return [row[0] for row in rows]
         
 
-    def resolve_alias(self, name: str) -> str:
+    def resolve_alias(self, name: str, cache: Optional[dict[str, str]] = None) -> str:
         """
         Return the canonical name of an entity.
+        Results are memoized in-process until this index commits an alias change, or
+        until a commit by another connection or process is noticed (checked at most every
+        _ALIAS_CACHE_RECHECK seconds); inside a write transaction that has touched aliases,
+        only for the rest of that transaction (or in `cache`, if given).
         NOTE: may want to be more explicit about entity-DNE.
         """
-        with self._conn() as con:
-            alias_row = con.execute(
-                "SELECT entity_id FROM aliases WHERE alias = ?;",
-                (name,)
-            ).fetchone() # check if name is an alias
-            
-            if alias_row: # -> get canonical entity name
-                entity_row = con.execute(
-                    "SELECT name FROM entities WHERE id = ?;",
-                    (alias_row[0],)
-                ).fetchone()
-                return entity_row[0]
-            
-            entity_row = con.execute(
-                "SELECT name FROM entities WHERE name = ?;",
-                (name,)
-            ).fetchone() # if not alias, check if it's an entity name
-            
-            if entity_row:
-                return entity_row[0]
-        
-            return name # not an alias, not yet an entity
+        if cache is None:
+            cache = getattr(self._local, "resolved", None)
+        if cache is not None and name in cache:
+            return cache[name]
+        # the shared cache holds current committed resolutions; a transaction that changed
+        # aliases has to go to the db, and a snapshot() may be reading an older state
+        shared = (
+            not getattr(self._local, "aliases_dirty", False)
+            and getattr(self._local, "read_con", None) is None
+        )
+        if shared:
+            if time.monotonic() - self._alias_cache_checked >= _ALIAS_CACHE_RECHECK:
+                self._check_data_version()
+            canonical = self._alias_cache.get(name)
+            if canonical is not None:
+                return canonical
+            gen = self._alias_cache_gen
+        with self._read() as con:
+            row = con.execute(_SQL_RESOLVE_ALIAS, (name,)).fetchone()
+        # alias -> its entity's name; else the name itself (an entity, or not yet one)
+        canonical = row[0] if row and row[0] is not None else name
+        if cache is not None:
+            cache[name] = canonical
+        if shared and gen == self._alias_cache_gen:
+            alias_cache = self._alias_cache
+            if len(alias_cache) >= _ALIAS_CACHE_SIZE:
+                alias_cache.pop(next(iter(alias_cache)), None) # evict the oldest entry
+            alias_cache[name] = canonical
+        return canonical
     
 
     def load_entity_claims(self, name: str) -> list[ClaimData]:
-        """Load claims for entity and all its aliases."""
+        """Load claims for entity and all its aliases, newest claim_date first (undated last)."""
         canonical = self.resolve_alias(name)
 
-        with self._conn() as con:
-            entity_row = con.execute(
-                "SELECT id FROM entities WHERE name = ?;",
-                (canonical,)
-            ).fetchone()
-            
-            if not entity_row:
+        with self._read() as con:
+            # the entity's own claims plus those of any alias that is also an entity
+            rows = _named(con).execute(_SQL_ENTITY_AND_ALIAS_CLAIMS, (canonical,)).fetchall()
+            if not rows and not con.execute(_SQL_ENTITY_ID, (canonical,)).fetchone():
                 raise EntityNotFoundError(canonical)
             
-            canonical_id = entity_row[0]
-            
-            alias_rows = con.execute(
-                "SELECT alias FROM aliases WHERE entity_id = ?;",
-                (canonical_id,)
-            ).fetchall() # get all alias names for canonical entity
-            
-            alias_names = [row[0] for row in alias_rows]
-            
-            # get entity IDs for all names (canonical + aliases that are also entities)
-            all_names = [canonical] + alias_names
-            placeholders = ','.join('?' * len(all_names))
-            
-            entity_ids = con.execute(
-                f"SELECT id FROM entities WHERE name IN ({placeholders});",
-                all_names
-            ).fetchall()
-            
-            entity_id_list = [row[0] for row in entity_ids]
-            
-            if not entity_id_list:
-                return []
-            
-            # load claims from all these entity IDs
-            id_placeholders = ','.join('?' * len(entity_id_list))
-            rows = con.execute(f"""
-                SELECT content, source, date_added, claim_date
-                FROM claims 
-                WHERE entity_id IN ({id_placeholders});
-            """, entity_id_list).fetchall()
-            
             return [
                 ClaimData(
                     content=row["content"],
@@ -379,57 +802,51 @@ class GraphIndex:
     ) -> list[RelationshipRecord]:
         """Load relationships for an entity and all its aliases."""
         canonical = self.resolve_alias(name)
-        with self._conn() as con:
-            canonical_row = con.execute(
-                "SELECT id FROM entities WHERE name = ?;",
-                (canonical,)
-            ).fetchone()
-            
-            if not canonical_row:
-                raise EntityNotFoundError(canonical)
-            canonical_id = canonical_row[0]
-
-            # collect canonical + alias-entity ids
-            entity_ids = self._expand_ids(con, canonical)
-            ps = ",".join("?" * len(entity_ids))
-            params: list = entity_ids + entity_ids
-
-            where = [f"(r.source_id IN ({ps}) OR r.target_id IN ({ps}))"]
+        with self._read() as con:
+            params = {"canonical": canonical}
+            where = ["(r.source_id IN ids OR r.target_id IN ids)"]
             if min_strength is not None:
-                where.append("r.strength >= ?")
-                params.append(min_strength)
+                where.append("r.strength >= :min_strength")
+                params["min_strength"] = min_strength
             if directed is not None:
-                where.append("r.directed = ?")
-                params.append(int(bool(directed)))
+                where.append("r.directed = :directed")
+                params["directed"] = int(bool(directed))
 
-            # prefer rows where the canonical participates for deterministic dedupe
+            # dedupe on the normalized (min, max, 0) / (src, tgt, 1) key in SQL; the first row
+            # per key wins, preferring rows where the canonical participates
             order = (
-                "ORDER BY CASE WHEN r.source_id = ? OR r.target_id = ? THEN 0 ELSE 1 END, "
+                "CASE WHEN r.source_id IN canon OR r.target_id IN canon THEN 0 ELSE 1 END, "
                 "r.directed DESC, r.id"
             )
-            params.extend([canonical_id, canonical_id])
-
             sql = f"""
-                SELECT e1.name AS source, e2.name AS target, r.strength, r.source_id, r.target_id, r.directed
-                FROM relationships r
-                JOIN entities e1 ON r.source_id = e1.id
-                JOIN entities e2 ON r.target_id = e2.id
-                WHERE {' AND '.join(where)}
-                {order};
+                WITH canon AS (SELECT id FROM entities WHERE name = :canonical),
+                ids AS ( -- canonical + alias-entity ids
+                    SELECT id FROM canon
+                    UNION
+                    SELECT e.id FROM aliases a JOIN entities e ON e.name = a.alias
+                    WHERE a.entity_id IN canon
+                )
+                SELECT source, target, strength, directed FROM (
+                    SELECT e1.name AS source, e2.name AS target, r.strength, r.directed,
+                        ROW_NUMBER() OVER (
+                            PARTITION BY
+                                CASE WHEN r.directed = 0 THEN MIN(r.source_id, r.target_id) ELSE r.source_id END,
+                                CASE WHEN r.directed = 0 THEN MAX(r.source_id, r.target_id) ELSE r.target_id END,
+                                r.directed = 0
+                            ORDER BY {order}
+                        ) AS rn,
+                        ROW_NUMBER() OVER (ORDER BY {order}) AS pos
+                    FROM relationships r
+                    JOIN entities e1 ON r.source_id = e1.id
+                    JOIN entities e2 ON r.target_id = e2.id
+                    WHERE {' AND '.join(where)}
+                )
+                WHERE rn = 1
+                ORDER BY pos;
             """
-            rows = con.execute(sql, params).fetchall()
-
-            seen: dict[tuple[int, int, int], sqlite3.Row] = {}
-            for row in rows:
-                s_id = row["source_id"]
-                t_id = row["target_id"]
-                d_int = int(row["directed"])
-                if d_int == 0:
-                    key = (min(s_id, t_id), max(s_id, t_id), 0)
-                else:
-                    key = (s_id, t_id, 1)
-                if key not in seen:
-                    seen[key] = row  # first row wins due to ORDER BY
+            rows = _named(con).execute(sql, params).fetchall()
+            if not rows and not con.execute(_SQL_ENTITY_ID, (canonical,)).fetchone():
+                raise EntityNotFoundError(canonical)
 
             return [
                 RelationshipRecord(
@@ -438,7 +855,7 @@ class GraphIndex:
                     strength=r["strength"],
                     directed=bool(r["directed"]),
                 )
-                for r in seen.values()
+                for r in rows
             ]
 
 
@@ -447,34 +864,20 @@ class GraphIndex:
         target_name: str,
         directed: Optional[bool] = None
     ) -> list[ClaimData]:
-        """Load claims for a rel between src and tgt (includes all aliases)"""
+        """Load claims for a rel between src and tgt (includes all aliases), newest claim_date first."""
         source_canonical = self.resolve_alias(source_name)
         target_canonical = self.resolve_alias(target_name)
         if source_canonical == target_canonical:
             raise RelationshipCollisionError(source_name, target_name)
         
-        with self._conn() as con:
-            # gather relationship ids per directed setting
-            rel_ids: list[int] = []
-            if directed is None:
-                # both undirected and both directed orientations
-                rel_ids.extend(self._relationship_ids_alias_expanded(con, source_canonical, target_canonical, False))
-                rel_ids.extend(self._relationship_ids_alias_expanded(con, source_canonical, target_canonical, True))
-                rel_ids.extend(self._relationship_ids_alias_expanded(con, target_canonical, source_canonical, True))
-            elif directed is True:
-                rel_ids.extend(self._relationship_ids_alias_expanded(con, source_canonical, target_canonical, True))
-            else:
-                rel_ids.extend(self._relationship_ids_alias_expanded(con, source_canonical, target_canonical, False))
-
-            if not rel_ids:
-                return []
-            
-            placeholders = ",".join("?" * len(rel_ids))
-            rows = con.execute(f"""
+        rel_sql, rel_params = self._relationship_id_subquery(source_canonical, target_canonical, directed)
+        with self._read() as con:
+            rows = _named(con).execute(f"""
                 SELECT content, source, date_added, claim_date
                 FROM claims
-                WHERE relationship_id IN ({placeholders});
-            """, rel_ids).fetchall()
+                WHERE relationship_id IN ({rel_sql})
+                ORDER BY COALESCE(claim_date, '') = '', claim_date DESC, id;
+            """, rel_params).fetchall()
 
             return [
                 ClaimData(
@@ -497,99 +900,86 @@ class GraphIndex:
         - Claims from both are consolidated
         - Alias entity is deleted (alias mapping remains)
         """
-        with self._conn() as con:
-            canonical_row = con.execute(
-                "SELECT id FROM entities WHERE name = ?;", (canonical_name,)
-            ).fetchone()
-            if not canonical_row:
-                is_an_alias_of = self.resolve_alias(canonical_name)
-                if is_an_alias_of and is_an_alias_of != canonical_name:
-                    raise EntityNotFoundError(
-                        canonical_name,
-                        message=(
-                            f"Entity '{canonical_name}' not found in graph. "
-                            f"It looks like you passed in an alias of {is_an_alias_of}."
-                        )
+        with self._write() as con:
+            self._merge_alias_locked(con, canonical_name, alias_name)
+
+
+    def _merge_alias_locked(self, con: sqlite3.Connection, canonical_name: str, alias_name: str):
+        """merge_alias() body, run on the caller's write connection / transaction."""
+        canonical_row = con.execute(
+            _SQL_ENTITY_ID, (canonical_name,)
+        ).fetchone()
+        if not canonical_row:
+            is_an_alias_of = self.resolve_alias(canonical_name)
+            if is_an_alias_of and is_an_alias_of != canonical_name:
+                raise EntityNotFoundError(
+                    canonical_name,
+                    message=(
+                        f"Entity '{canonical_name}' not found in graph. "
+                        f"It looks like you passed in an alias of {is_an_alias_of}."
                     )
-                else:
-                    raise EntityNotFoundError(canonical_name)
-            canonical_id = canonical_row[0]
-            
-            # verify alias_name is actually an alias of canonical_name
-            alias_mapping = con.execute(
-                "SELECT entity_id FROM aliases WHERE alias = ?;", (alias_name,)
-            ).fetchone()
-            if not alias_mapping:
-                raise ValueError(f"'{alias_name}' is not an alias")
-            if alias_mapping[0] != canonical_id:
-                raise ValueError(f"'{alias_name}' is not an alias of '{canonical_name}'")
-            
-            # get alias entity id (if it exists as an entity)
-            alias_row = con.execute(
-                "SELECT id FROM entities WHERE name = ?;", (alias_name,)
-            ).fetchone()
-            if not alias_row: # if alias doesn't exist as entity, nothing to merge
-                log.info("%s has no entity data to merge", alias_name)
-                return
-            alias_id = alias_row[0]
-            
-            # migrate relationships from alias to canonical (normalize undirected)
-            alias_relationships = con.execute("""
-                SELECT id, source_id, target_id, strength, directed
-                FROM relationships
-                WHERE source_id = ? OR target_id = ?;
-            """, (alias_id, alias_id)).fetchall()
-            
-            for rel in alias_relationships:
-                rel_id, source_id, target_id, strength, directed = rel
-                
-                # update ids: replace alias_id with canonical_id
-                new_source_id = canonical_id if source_id == alias_id else source_id
-                new_target_id = canonical_id if target_id == alias_id else target_id
-                
-                # self-loop sanity check
-                if new_source_id == new_target_id:
-                    raise RelationshipMergeConflict(canonical_name, alias_name)
-                
-                new_source_id, new_target_id, directed_int = self._normalize_pair(
-                    new_source_id, new_target_id, directed
                 )
+            else:
+                raise EntityNotFoundError(canonical_name)
+        canonical_id = canonical_row[0]
+        
+        # verify alias_name is actually an alias of canonical_name
+        alias_mapping = con.execute(
+            _SQL_ALIAS_ENTITY_ID, (alias_name,)
+        ).fetchone()
+        if not alias_mapping:
+            raise ValueError(f"'{alias_name}' is not an alias")
+        if alias_mapping[0] != canonical_id:
+            raise ValueError(f"'{alias_name}' is not an alias of '{canonical_name}'")
+        
+        # get alias entity id (if it exists as an entity)
+        alias_row = con.execute(
+            _SQL_ENTITY_ID, (alias_name,)
+        ).fetchone()
+        if not alias_row: # if alias doesn't exist as entity, nothing to merge
+            log.info("%s has no entity data to merge", alias_name)
+            return
+        alias_id = alias_row[0]
+        
+        # migrate relationships from alias to canonical (normalize undirected), set-based:
+        # alias_rels holds each alias relationship's new (ns, nt, directed) key and the id of
+        # the canonical relationship already holding that key, if any
+        con.execute(_SQL_ALIAS_RELS, {"alias": alias_id, "canonical": canonical_id})
+        try:
+            # self-loop sanity check
+            if con.execute("SELECT EXISTS(SELECT 1 FROM alias_rels WHERE ns = nt);").fetchone()[0]:
+                raise RelationshipMergeConflict(canonical_name, alias_name)
 
-                # check if canonical already has relationship to this target
-                existing_rel = con.execute("""
-                    SELECT id FROM relationships
-                    WHERE source_id = ? AND target_id = ? AND directed = ?;
-                """, (new_source_id, new_target_id, directed_int)).fetchone()
-                
-                if existing_rel:
-                    # move claims to existing; keep existing strength
-                    con.execute("""
-                        UPDATE claims
-                        SET relationship_id = ?
-                        WHERE relationship_id = ?;
-                    """, (existing_rel[0], rel_id))
-                    
-                    # delete alias relationship
-                    con.execute("DELETE FROM relationships WHERE id = ?;", (rel_id,))
-                else:
-                    # move relationship from alias to canonical
-                    con.execute("""
-                        UPDATE relationships
-                        SET source_id = ?, target_id = ?, directed = ?
-                        WHERE id = ?;
-                    """, (new_source_id, new_target_id, directed_int, rel_id))
-            
-            # migrate entity claims from alias to canonical
+            # canonical already has it: move claims to existing, keep existing strength, drop alias rel
             con.execute("""
-                UPDATE claims
-                SET entity_id = ?
-                WHERE entity_id = ?;
-            """, (canonical_id, alias_id))
-            
-            # delete alias entity (alias mapping remains in aliases table!)
-            con.execute("DELETE FROM entities WHERE id = ?;", (alias_id,))
-            
-            log.info("Successfully merged %s into %s", alias_name, canonical_name)
+                UPDATE claims SET relationship_id = a.existing_id
+                FROM alias_rels a
+                WHERE a.id = claims.relationship_id AND a.existing_id IS NOT NULL;
+            """)
+            con.execute("""
+                DELETE FROM relationships
+                WHERE id IN (SELECT id FROM alias_rels WHERE existing_id IS NOT NULL);
+            """)
+            # otherwise move the relationship itself over to canonical
+            con.execute("""
+                UPDATE relationships SET source_id = a.ns, target_id = a.nt, directed = a.directed
+                FROM alias_rels a
+                WHERE a.id = relationships.id AND a.existing_id IS NULL;
+            """)
+        finally:
+            con.execute("DROP TABLE IF EXISTS temp.alias_rels;")
+        
+        # migrate entity claims from alias to canonical
+        con.execute("""
+            UPDATE claims
+            SET entity_id = ?
+            WHERE entity_id = ?;
+        """, (canonical_id, alias_id))
+        
+        # delete alias entity (alias mapping remains in aliases table!)
+        con.execute(_SQL_DELETE_ENTITY, (alias_id,))
+        
+        log.info("Successfully merged %s into %s", alias_name, canonical_name)
 
 
     def merge_all_aliases(self, canonical_name: str, strategy: str = "error_on_conflict"):
@@ -599,7 +989,7 @@ class GraphIndex:
         Args:
             canonical_name: The canonical entity name
             strategy: How to handle errors:
-                - "error_on_conflict": Raise on first error (default)
+                - "error_on_conflict": Raise on first error (default); the whole batch is rolled back
                 - "skip_on_conflict": Log and continue on errors
         """
         aliases = self.load_aliases(canonical_name)
@@ -607,18 +997,22 @@ class GraphIndex:
         merged = []
         skipped = []
 
-        for alias in aliases:
-            try:
-                self.merge_alias(canonical_name, alias)
-                merged.append(alias)
-            except Exception as e:
-                if strategy == "error_on_conflict":
-                    raise e
-                elif strategy == "skip_on_conflict":
-                    log.warning("Skipping merge of %s: %s", alias, e)
-                    skipped.append((alias, str(e)))
-                else:
-                    raise ValueError(f"Unknown strategy: {strategy}")
+        # one transaction for the whole batch; each merge gets its own savepoint so a
+        # skipped alias leaves nothing half-migrated
+        with self._write() as con:
+            for alias in aliases:
+                try:
+                    with self._write():
+                        self._merge_alias_locked(con, canonical_name, alias)
+                    merged.append(alias)
+                except Exception as e:
+                    if strategy == "error_on_conflict":
+                        raise e
+                    elif strategy == "skip_on_conflict":
+                        log.warning("Skipping merge of %s: %s", alias, e)
+                        skipped.append((alias, str(e)))
+                    else:
+                        raise ValueError(f"Unknown strategy: {strategy}")
         
         log.info("Merged %s aliases for %s", len(merged), canonical_name)
         if skipped:
@@ -642,85 +1036,70 @@ class GraphIndex:
         - Delete alias mappings for this canonical.
         - Delete the canonical entity row.
         """
-        canonical = self.resolve_alias(name)
+        with self._write() as con:
+            canonical = self.resolve_alias(name)
+            if name != canonical:
+                msg = (
+                    f"Cannot delete: '{name}' is an alias of '{canonical}'. "
+                    f"Delete the canonical entity '{canonical}' instead, "
+                    f"or delete the '{name}' alias from '{canonical}' before proceeding."
+                )
+                raise DeletionConflict(name, "entities", message=msg)
 
-        if name != canonical:
-            msg = (
-                f"Cannot delete: '{name}' is an alias of '{canonical}'. "
-                f"Delete the canonical entity '{canonical}' instead, "
-                f"or delete the '{name}' alias from '{canonical}' before proceeding."
-            )
-            raise DeletionConflict(name, "entities", message=msg)
-        
-        with self._conn() as con:
             row = con.execute(
-                "SELECT id FROM entities WHERE name = ?;", (canonical,)
+                _SQL_ENTITY_ID, (canonical,)
             ).fetchone()
             if not row:
                 raise EntityNotFoundError(canonical)
             canonical_id = row[0]
 
-            try:
-                expanded_ids = self._expand_ids(con, canonical)
-            except EntityNotFoundError:
-                raise EntityNotFoundError(canonical)
-            
-            # guard: relationships touching canonical or any alias-entity
-            if expanded_ids:
-                placeholders = ",".join("?" * len(expanded_ids))
-                rels_guard = con.execute(
-                    f"""
-                    SELECT id FROM relationships
-                    WHERE source_id IN ({placeholders})
-                       OR target_id IN ({placeholders});
+            if not cascade:
+                try:
+                    expanded_ids = self._expand_ids(con, canonical)
+                except EntityNotFoundError:
+                    raise EntityNotFoundError(canonical)
+
+                # guard: relationships touching canonical or any alias-entity,
+                # and claims directly on the canonical entity
+                rel_count, claim_count = con.execute(
+                    """
+                    SELECT
+                        (SELECT COUNT(*) FROM relationships
+                         WHERE source_id IN (SELECT value FROM json_each(:ids))
+                            OR target_id IN (SELECT value FROM json_each(:ids))),
+                        (SELECT COUNT(*) FROM claims WHERE entity_id = :id);
                     """,
-                    expanded_ids + expanded_ids
-                ).fetchall()
-            else:
-                rels_guard = []
-
-            # guard: claims directly on the canonical entity
-            claims_guard = con.execute(
-                "SELECT id FROM claims WHERE entity_id = ?;",
-                (canonical_id,)
-            ).fetchall()
+                    {"ids": json.dumps(expanded_ids), "id": canonical_id}
+                ).fetchone()
 
-            if not cascade:
-                rel_count = len(rels_guard)
-                claim_count = len(claims_guard)
-                if rels_guard and claims_guard:
+                if rel_count and claim_count:
                     msg = (
                         f"Entity '{canonical}' has {rel_count} relationships and {claim_count} claims. "
                         f"Use cascade=True or clean up manually."
                     )
                     raise DeletionConflict(canonical, "entities", message=msg)
-                elif rels_guard:
+                elif rel_count:
                     msg = (
                         f"Entity '{canonical}' has {rel_count} relationships. "
                         f"Use cascade=True or clean up manually."
                     )
                     raise DeletionConflict(canonical, "entities", message=msg)
-                elif claims_guard:
+                elif claim_count:
                     msg = (
                         f"Entity '{canonical}' has {claim_count} claims. "
                         f"Use cascade=True or clean up manually."
                     )
                     raise DeletionConflict(canonical, "entities", message=msg)
 
-            # delete relationship claims, then relationships
-            rels = con.execute(
-                "SELECT id FROM relationships WHERE source_id = ? OR target_id = ?;",
-                (canonical_id, canonical_id)
-            ).fetchall()
-            for rel in rels:
-                rel_id = rel[0]
-                con.execute("DELETE FROM claims WHERE relationship_id = ?;", (rel_id,))
-                con.execute("DELETE FROM relationships WHERE id = ?;", (rel_id,))
-
-            # delete entity claims // entity aliases // entity itself
-            con.execute("DELETE FROM claims WHERE entity_id = ?;", (canonical_id,))
+            # delete relationships // entity aliases // entity itself;
+            # relationship and entity claims go with them (ON DELETE CASCADE)
+            con.execute(
+                "DELETE FROM relationships WHERE source_id = :id OR target_id = :id;",
+                {"id": canonical_id}
+            )
             con.execute("DELETE FROM aliases WHERE entity_id = ?;", (canonical_id,))
-            con.execute("DELETE FROM entities WHERE id = ?;", (canonical_id,))
+            self._forget_resolved()
+            con.execute(_SQL_DELETE_ENTITY, (canonical_id,))
 
 
     def delete_relationship(self,
@@ -738,36 +1117,27 @@ class GraphIndex:
         - If no matches exist, this is a no-op (idempotent delete).
         - If cascade=False and any matched relationship has claims, raise.
         """
-        source_canonical = self.resolve_alias(source)
-        target_canonical = self.resolve_alias(target)
+        with self._write() as con:
+            source_canonical = self.resolve_alias(source)
+            target_canonical = self.resolve_alias(target)
 
-        if source_canonical == target_canonical:
-            raise RelationshipCollisionError(source, target)
-
-        with self._conn() as con:
-            rel_ids: list[int] = []
-            if directed is None:
-                rel_ids.extend(self._relationship_ids_alias_expanded(con, source_canonical, target_canonical, False))
-                rel_ids.extend(self._relationship_ids_alias_expanded(con, source_canonical, target_canonical, True))
-                rel_ids.extend(self._relationship_ids_alias_expanded(con, target_canonical, source_canonical, True))
-            elif directed is True:
-                rel_ids.extend(self._relationship_ids_alias_expanded(con, source_canonical, target_canonical, True))
-            else:
-                rel_ids.extend(self._relationship_ids_alias_expanded(con, source_canonical, target_canonical, False))
-           
-            if not rel_ids:
-                log.info("No relationship found between %s and %s.", source_canonical, target_canonical)
-                return
+            if source_canonical == target_canonical:
+                raise RelationshipCollisionError(source, target)
+
+            rel_sql, rel_params = self._relationship_id_subquery(source_canonical, target_canonical, directed)
 
             # if cascade is off, ensure none of the matched rels have claims
             if not cascade:
-                placeholders = ",".join("?" * len(rel_ids))
-                claims_guard = con.execute(
-                    f"SELECT 1 FROM claims WHERE relationship_id IN ({placeholders}) LIMIT 1;",
-                    rel_ids
-                ).fetchone()
-                if claims_guard:
-                    claim_count = len(claims_guard)
+                has_claims = con.execute(
+                    f"SELECT EXISTS(SELECT 1 FROM claims WHERE relationship_id IN ({rel_sql}));",
+                    rel_params
+                ).fetchone()[0]
+                if has_claims:
+                    # only count on the way out, for the message
+                    claim_count = con.execute(
+                        f"SELECT COUNT(*) FROM claims WHERE relationship_id IN ({rel_sql});",
+                        rel_params
+                    ).fetchone()[0]
                     msg = (
                         f"Relationship between '{source_canonical}' "
                         f"and '{target_canonical}' has {claim_count} claims. "
@@ -775,16 +1145,10 @@ class GraphIndex:
                     )
                     raise DeletionConflict(source_canonical, "relationships", message=msg)
 
-            # cascade delete claims for all matched relationships, then the relationships
-            placeholders = ",".join("?" * len(rel_ids))
-            con.execute(
-                f"DELETE FROM claims WHERE relationship_id IN ({placeholders});",
-                rel_ids
-            )
-            con.execute(
-                f"DELETE FROM relationships WHERE id IN ({placeholders});",
-                rel_ids
-            )
+            # their claims are removed by ON DELETE CASCADE
+            cur = con.execute(f"DELETE FROM relationships WHERE id IN ({rel_sql});", rel_params)
+            if not cur.rowcount:
+                log.info("No relationship found between %s and %s.", source_canonical, target_canonical)
 
 
     def delete_alias(self, entity_name: str, alias: str) -> None:
@@ -798,30 +1162,22 @@ class GraphIndex:
             msg = (f"Cannot delete alias: '{entity_name}' is an alias of '{canonical}'.")
             raise DeletionConflict(alias, "aliases", message=msg)
 
-        with self._conn() as con:
-            ent_row = con.execute(
-                "SELECT id FROM entities WHERE name = ?;", (entity_name,)
-            ).fetchone()
-            if not ent_row:
+        with self._write() as con:
+            row = con.execute(_SQL_ALIAS_MAPPING, {"alias": alias, "entity": entity_name}).fetchone()
+            if not row:
                 raise EntityNotFoundError(entity_name)
-            entity_id = ent_row[0]
+            entity_id, mapping_id, owner_id, owner_name = row
 
-            mapping = con.execute(
-                "SELECT entity_id, id FROM aliases WHERE alias = ?;",
-                (alias,)
-            ).fetchone()
-            if not mapping:
+            if mapping_id is None:
                 raise AliasConflictError(alias, "<unmapped>", entity_name,
                     message=f"'{alias}' is not an alias of '{entity_name}' (no mapping found).")
             
-            if mapping[0] != entity_id:
-                other_name = con.execute(
-                "SELECT name FROM entities WHERE id = ?;", (mapping[0],)
-            ).fetchone()[0]
-                raise AliasConflictError(alias, other_name, entity_name,
-                    message=f"'{alias}' is mapped to '{other_name}', not '{entity_name}'.")
+            if owner_id != entity_id:
+                raise AliasConflictError(alias, owner_name, entity_name,
+                    message=f"'{alias}' is mapped to '{owner_name}', not '{entity_name}'.")
             
-            con.execute("DELETE FROM aliases WHERE id = ?;", (mapping[1],))
+            con.execute("DELETE FROM aliases WHERE id = ?;", (mapping_id,))
+            self._forget_resolved()
 
 
     def delete_claim(self,
@@ -854,90 +1210,82 @@ class GraphIndex:
         if not any([content, entity_name, relationship, source, date_range]):
             raise ValueError("Must provide at least one filter criterion")
 
-        with self._conn() as con:
+        values = {
+            "entity_name": entity_name,
+            "relationship": relationship,
+            "content": content,
+            "source": source,
+            "date_range": date_range,
+        }
+        if mode == "exact":
+            fields = [field for field in self._CLAIM_FILTERS if values[field]]
+        elif mode in self._CLAIM_FILTER_MODES:
+            field = self._CLAIM_FILTER_MODES[mode]
+            if not values[field]:
+                raise ValueError(f"Mode '{mode}' needs {field}")
+            fields = [field]
+        else:
+            raise ValueError(f"Unsupported mode: {mode}")
+
+        with self._write() as con:
             clauses = []
             params = []
-
-            def add_entity_clause(name: str):
-                canonical = self.resolve_alias(name)
-                row = con.execute("SELECT id FROM entities WHERE name = ?;", (canonical,)).fetchone()
-                if not row:
-                    return None
-                return ("entity_id = ?", [row[0]])
-
-            if mode == "by_entity" and entity_name:
-                clause = add_entity_clause(entity_name)
+            for field in fields:
+                clause = self._CLAIM_FILTERS[field](self, con, values[field], directed)
                 if clause is None:
                     return # no-op
                 clauses.append(clause[0])
                 params.extend(clause[1])
 
-            elif mode == "by_relationship" and relationship:
-                src, tgt = relationship
-                rel_ids = []
-                if directed is None or directed is False:
-                    rel_ids.extend(self._relationship_ids_alias_expanded(con, src, tgt, False))
-                if directed is True:
-                    rel_ids.extend(self._relationship_ids_alias_expanded(con, src, tgt, True))
-                if not rel_ids:
-                    return
-                placeholders = ",".join("?" * len(rel_ids))
-                clauses.append(f"relationship_id IN ({placeholders})")
-                params.extend(rel_ids)
-
-            elif mode == "by_source" and source:
-                clauses.append("source = ?")
-                params.append(source)
-
-            elif mode == "by_date" and date_range:
-                clauses.append("date_added BETWEEN ? AND ?")
-                params.extend(date_range)
-
-            elif mode == "by_content" and content:
-                clauses.append("content = ?")
-                params.append(content)
-
-            elif mode == "exact":
-                if entity_name: # entity filter (conservative)
-                    clause = add_entity_clause(entity_name)
-                    if clause is None:
-                        return  # no-op
-                    clauses.append(clause[0])
-                    params.extend(clause[1])
-                if relationship:
-                    src, tgt = relationship
-                    rel_ids = []
-                    if directed is None or directed is False:
-                        rel_ids.extend(self._relationship_ids_alias_expanded(con, src, tgt, False))
-                    if directed is True:
-                        rel_ids.extend(self._relationship_ids_alias_expanded(con, src, tgt, True))
-                    if not rel_ids:
-                        return
-                    placeholders = ",".join("?" * len(rel_ids))
-                    clauses.append(f"relationship_id IN ({placeholders})")
-                    params.extend(rel_ids)
-                if content:
-                    clauses.append("content = ?")
-                    params.append(content)
-                if source:
-                    clauses.append("source = ?")
-                    params.append(source)
-                if date_range:
-                    clauses.append("date_added BETWEEN ? AND ?")
-                    params.extend(date_range)
-            else:
-                raise ValueError(f"Unsupported mode: {mode}")
-            
-            if not clauses:
-                return
-
             sql = "DELETE FROM claims WHERE " + " AND ".join(clauses)
             con.execute(sql, tuple(params))
+
+
+    # delete_claim() filters: each returns (clause, params), or None if nothing can match
+
+    def _entity_claim_clause(self, con, name: str, directed):
+        # conservative: the canonical entity's own claims only
+        canonical = self.resolve_alias(name)
+        row = con.execute(_SQL_ENTITY_ID, (canonical,)).fetchone()
+        if not row:
+            return None
+        return "entity_id = ?", [row[0]]
+
+    def _relationship_claim_clause(self, con, relationship: tuple[str, str], directed):
+        # alias-expanded; None counts as undirected here, and no matching relationship
+        # just matches no claims
+        rel_sql, rel_params = self._relationship_id_subquery(*relationship, directed is True)
+        return f"relationship_id IN ({rel_sql})", rel_params
+
+    def _content_claim_clause(self, con, content: str, directed):
+        return "content = ?", [content]
+
+    def _source_claim_clause(self, con, source: str, directed):
+        return "source = ?", [source]
+
+    def _date_claim_clause(self, con, date_range: tuple[str, str], directed):
+        return "date_added BETWEEN ? AND ?", list(date_range)
+
+    # filter -> clause builder; also the order `exact` mode ANDs them in
+    _CLAIM_FILTERS = {
+        "entity_name": _entity_claim_clause,
+        "relationship": _relationship_claim_clause,
+        "content": _content_claim_clause,
+        "source": _source_claim_clause,
+        "date_range": _date_claim_clause,
+    }
+    _CLAIM_FILTER_MODES = {
+        "by_entity": "entity_name",
+        "by_relationship": "relationship",
+        "by_content": "content",
+        "by_source": "source",
+        "by_date": "date_range",
+    }
     
 
     def entity_exists(self, name: str) -> bool:
         """Check if entity exists in DB"""
-        with self._conn() as con:
+        with self._read() as con:
             result = con.execute(
                 "SELECT 1 FROM entities WHERE name = ? LIMIT 1;",
                 (name,)
@@ -950,17 +1298,33 @@ class GraphIndex:
         List all canonical entity names in the graph.
         Does not include aliases.
         """
-        with self._conn() as con:
+        with self._read() as con:
             rows = con.execute("SELECT name FROM entities ORDER BY name;").fetchall()
             return [row[0] for row in rows]
     
 
+    def list_canonical_entities(self) -> list[str]:
+        """
+        List entity names that are not themselves an alias of another entity,
+        sorted case-insensitively (NOCASE folds ASCII only).
+        """
+        with self._read() as con:
+            rows = con.execute("""
+                SELECT e.name
+                FROM entities e
+                LEFT JOIN aliases a ON a.alias = e.name
+                WHERE a.id IS NULL
+                ORDER BY e.name COLLATE NOCASE, e.name;
+            """).fetchall()
+            return [row[0] for row in rows]
+
+
     def list_all_aliases(self, entity_name: str) -> list[str]:
         """Return all aliases for an entity"""
         canonical = self.resolve_alias(entity_name)
-        with self._conn() as con:
+        with self._read() as con:
             ent_row = con.execute(
-                "SELECT id FROM entities WHERE name = ?;",
+                _SQL_ENTITY_ID,
                 (canonical,)
             ).fetchone()
             if not ent_row:
@@ -991,132 +1355,118 @@ class GraphIndex:
         return source_id, target_id, d
 
 
+    def _resolve_many(self, con, names: Iterable[str]) -> dict[str, str]:
+        """resolve_alias() for many names on an open connection, a chunk per query."""
+        resolved: dict[str, str] = {}
+        for chunk in _chunked(names, _BULK_CHUNK):
+            chunk = _padded(chunk, _BULK_CHUNK)
+            rows = con.execute(f"""
+                WITH x(n) AS (VALUES {",".join(["(?)"] * len(chunk))})
+                SELECT x.n, COALESCE(e2.name, e1.name)
+                FROM x
+                LEFT JOIN aliases a ON a.alias = x.n
+                LEFT JOIN entities e2 ON e2.id = a.entity_id
+                LEFT JOIN entities e1 ON e1.name = x.n;
+            """, chunk).fetchall()
+            resolved.update({n: canon if canon is not None else n for n, canon in rows})
+        return resolved
+
+
+    def _upsert_entity_ids(self,
+        con,
+        names: Iterable[str],
+        entity_types: Optional[dict[str, Optional[str]]] = None,
+    ) -> dict[str, int]:
+        """
+        upsert_entity() for many (distinct) names on an open connection; returns {name: id}.
+        Types come from entity_types (a None / missing type keeps the stored one).
+        """
+        entity_types = entity_types or {}
+        ids: dict[str, int] = {}
+        for chunk in _chunked(names, _BULK_CHUNK // 2):
+            chunk = _padded(chunk, _BULK_CHUNK // 2) # a repeated name just upserts twice
+            rows = con.execute(f"""
+                INSERT INTO entities (name, entity_type, date_added)
+                VALUES {",".join(["(?, ?, CURRENT_TIMESTAMP)"] * len(chunk))}
+                ON CONFLICT(name)
+                DO UPDATE SET entity_type = COALESCE(excluded.entity_type, entities.entity_type)
+                RETURNING name, id;
+            """, [v for name in chunk for v in (name, entity_types.get(name))]).fetchall()
+            ids.update({name: ent_id for name, ent_id in rows})
+        return ids
+
+
+    @staticmethod
+    def _claim_date_iso8601(claim_date: Optional[str], now: Optional[str] = None) -> str:
+        """
+        Normalize a claim date to 'YYYY-MM-DD HH:MM:SS', keeping the wall-clock time as written;
+        `now` (default: the current UTC time) if missing or unparsable.
+        """
+        if claim_date is not None:
+            try: # | TODO: kinder parsing
+                return datetime.fromisoformat(claim_date).strftime("%Y-%m-%d %H:%M:%S")
+            except (TypeError, ValueError): # fallback to now
+                pass
+        return now or datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
     def _expand_ids(self, con, name: str) -> list[int]:
         """Return [canonical_id] plus ids of any alias-entities for this name."""
         canonical = self.resolve_alias(name)
-        row = con.execute("SELECT id FROM entities WHERE name = ?;", (canonical,)).fetchone()
-        if not row:
+        ids = [row[0] for row in con.execute(_SQL_EXPAND_IDS, {"name": canonical})]
+        if not ids: # no canonical row (alias-entities hang off it, so they're empty too)
             raise EntityNotFoundError(canonical)
-        ids = [row[0]]
-
-        alias_rows = con.execute(
-            "SELECT alias FROM aliases WHERE entity_id = ?;", (row[0],)
-        ).fetchall()
-        for alias_row in alias_rows:
-            alias_entity = con.execute(
-                "SELECT id FROM entities WHERE name = ?;", (alias_row[0],)
-            ).fetchone()
-            if alias_entity:
-                ids.append(alias_entity[0])
         return ids
     
 
-    def _relationship_ids_alias_expanded(self,
-        con,
+    def _relationship_id_subquery(self,
         src_name: str,
         tgt_name: str,
         directed: Optional[bool]
-    ) -> list[int]:
+    ) -> tuple[str, list]:
         """
-        Helper: return relationship IDs between alias-expanded src and tgt families.
+        Helper: SQL selecting the ids of relationships between the alias-expanded src and
+        tgt families, and its params. Nothing is fetched; embed it as `IN ({sql})`.
         - directed is True: only directed edges source→target.
         - directed is False: only undirected edges (unordered).
+        - directed is None: undirected edges plus directed edges either way.
         """
-        try:
-            src_ids = self._expand_ids(con, self.resolve_alias(src_name))
-            tgt_ids = self._expand_ids(con, self.resolve_alias(tgt_name))
-        except EntityNotFoundError:
-            return []
-
-        ps_src = ",".join("?" * len(src_ids))
-        ps_tgt = ",".join("?" * len(tgt_ids))
-
-        if directed is True:
-            sql = f"""
-                SELECT id FROM relationships
-                WHERE directed = 1
-                AND source_id IN ({ps_src}) AND target_id IN ({ps_tgt});
-            """
-            params = src_ids + tgt_ids
-        else:
-            # directed is False (or None in callers that want undirected only)
-            sql = f"""
+        src = self.resolve_alias(src_name)
+        tgt = self.resolve_alias(tgt_name)
+        fam = _SQL_FAMILY_IDS # 2 params: the canonical name, twice
+
+        parts: list[str] = []
+        params: list = []
+        if directed is not True:
+            parts.append(f"""
                 SELECT id FROM relationships
                 WHERE directed = 0 AND (
-                    (source_id IN ({ps_src}) AND target_id IN ({ps_tgt}))
+                    (source_id IN ({fam}) AND target_id IN ({fam}))
                     OR
-                    (source_id IN ({ps_tgt}) AND target_id IN ({ps_src}))
-                );
-            """
-            params = src_ids + tgt_ids + tgt_ids + src_ids
-
-        rows = con.execute(sql, params).fetchall()
-        return [r[0] for r in rows]
+                    (source_id IN ({fam}) AND target_id IN ({fam}))
+                )
+            """)
+            params += [src, src, tgt, tgt, tgt, tgt, src, src]
+        if directed is not False:
+            parts.append(f"""
+                SELECT id FROM relationships
+                WHERE directed = 1 AND source_id IN ({fam}) AND target_id IN ({fam})
+            """)
+            params += [src, src, tgt, tgt]
+        if directed is None:
+            parts.append(f"""
+                SELECT id FROM relationships
+                WHERE directed = 1 AND source_id IN ({fam}) AND target_id IN ({fam})
+            """)
+            params += [tgt, tgt, src, src]
+        return " UNION ALL ".join(parts), params
 
 
     def _has_relationship_between(self, entity1_name: str, entity2_name: str) -> bool:
         """Check if any relationship exists between two entities (considering aliases)."""
-        with self._conn() as con:
-            entity1_canonical = self.resolve_alias(entity1_name)
-            entity1_row = con.execute(
-                "SELECT id FROM entities WHERE name = ?;",
-                (entity1_canonical,)
-            ).fetchone()
-            
-            if not entity1_row:
-                return False
-            
-            entity1_ids = [entity1_row[0]]
-            
-            alias_rows = con.execute(
-                "SELECT alias FROM aliases WHERE entity_id = ?;",
-                (entity1_row[0],)
-            ).fetchall() # add alias entity IDs for entity1
-            
-            for alias_row in alias_rows:
-                alias_entity = con.execute(
-                    "SELECT id FROM entities WHERE name = ?;",
-                    (alias_row[0],)
-                ).fetchone()
-                if alias_entity:
-                    entity1_ids.append(alias_entity[0])
-            
-            entity2_canonical = self.resolve_alias(entity2_name)
-            entity2_row = con.execute(
-                "SELECT id FROM entities WHERE name = ?;",
-                (entity2_canonical,)
-            ).fetchone() # get all entity IDs for entity2
-            
-            if not entity2_row:
-                return False
-            
-            entity2_ids = [entity2_row[0]]
-            
-            alias_rows = con.execute(
-                "SELECT alias FROM aliases WHERE entity_id = ?;",
-                (entity2_row[0],)
-            ).fetchall() # add alias entity IDs for entity2
-            
-            for alias_row in alias_rows:
-                alias_entity = con.execute(
-                    "SELECT id FROM entities WHERE name = ?;",
-                    (alias_row[0],)
-                ).fetchone()
-                if alias_entity:
-                    entity2_ids.append(alias_entity[0])
-            
-            # check if any relationship exists between any combination
-            placeholders1 = ','.join('?' * len(entity1_ids))
-            placeholders2 = ','.join('?' * len(entity2_ids))
-            
-            result = con.execute(f"""
-                SELECT 1 FROM relationships 
-                WHERE (source_id IN ({placeholders1}) AND target_id IN ({placeholders2}))
-                OR (source_id IN ({placeholders2}) AND target_id IN ({placeholders1}))
-                LIMIT 1;
-            """, entity1_ids + entity2_ids + entity2_ids + entity1_ids).fetchone()
-            
-            return result is not None
+        params = {"a": self.resolve_alias(entity1_name), "b": self.resolve_alias(entity2_name)}
+        with self._read() as con:
+            return bool(con.execute(_SQL_HAS_RELATIONSHIP_BETWEEN, params).fetchone()[0])
     
 
     @debug_only
@@ -1125,9 +1475,9 @@ class GraphIndex:
         Load claims for exact entity name without alias resolution.
         This is for debugging and inspection. Normal code should use load_entity_claims().
         """
-        with self._conn() as con:
+        with self._read() as con:
             entity_row = con.execute(
-                "SELECT id FROM entities WHERE name = ?;",
+                _SQL_ENTITY_ID,
                 (name,)
             ).fetchone()
             
@@ -1136,11 +1486,7 @@ class GraphIndex:
             
             entity_id = entity_row[0]
             
-            rows = con.execute("""
-                SELECT content, source, date_added, claim_date
-                FROM claims 
-                WHERE entity_id = ?;
-            """, (entity_id,)).fetchall()
+            rows = _named(con).execute(_SQL_ENTITY_CLAIMS, (entity_id,)).fetchall()
             
             return [
                 ClaimData(
@@ -1157,8 +1503,8 @@ class GraphIndex:
         """
         Returns list of all relationships with resolved names.
         """
-        with self._conn() as con:
-            rows = con.execute("""
+        with self._read() as con:
+            rows = _named(con).execute("""
                 SELECT
                     r.id AS relationship_id,
                     e1.name AS source_name,
@@ -1173,10 +1519,53 @@ class GraphIndex:
         return rows
         
     
+    def iter_all_relationships(self):
+        """
+        Same rows as dump_all_relationships(), yielded straight off the cursor instead of
+        collected into a list. The connection stays open until the generator is exhausted.
+        """
+        with self._read() as con:
+            yield from _named(con).execute("""
+                SELECT
+                    r.id AS relationship_id,
+                    e1.name AS source_name,
+                    e2.name AS target_name,
+                    r.strength AS strength,
+                    r.directed AS directed
+                FROM relationships r
+                JOIN entities e1 ON e1.id = r.source_id
+                JOIN entities e2 ON e2.id = r.target_id;
+            """)
+
+
+    def list_entities_with_meta(self) -> list[tuple[str, Optional[str], int]]:
+        """
+        Return (name, entity_type, claim_count) for every entity, aliases included.
+        Counts are the entity's own claims (not rolled up to its canonical).
+        """
+        with self._read() as con:
+            return con.execute("""
+                SELECT e.name, e.entity_type, COUNT(c.id)
+                FROM entities e
+                LEFT JOIN claims c ON c.entity_id = e.id
+                GROUP BY e.id;
+            """).fetchall()
+
+
+    def dump_alias_map(self) -> dict[str, str]:
+        """Return {alias: canonical_name} for every alias mapping (resolve_alias() for all aliases at once)."""
+        with self._read() as con:
+            return dict(con.execute("""
+                SELECT a.alias, e.name
+                FROM aliases a
+                JOIN entities e ON e.id = a.entity_id;
+            """))
+
+
     def dump_all_claims(self):
         """Return list of dict-like rows for all claims (entity_id or relationship_id present)."""
-        with self._conn() as con:
-            rows = con.execute("""
+        with self._read() as con:
+            rows = _named(con).execute("""
                 SELECT id AS claim_id,
                     entity_id,
                     relationship_id,
@@ -2,7 +2,9 @@ from __future__ import annotations
 
 from contextlib import contextmanager
 from pathlib import Path
+from typing import Optional
 import sqlite3
+import threading
 
 from ...config import log
 from .._schemas import (
@@ -21,27 +23,44 @@ class MetaIndex:
 
     def __init__(self, index_path: str | Path):
         self.index_path = Path(index_path)
+        # one long-lived connection, opened on first use and shared by every call;
+        # _lock serializes the calls so transactions don't interleave across threads
+        self._con: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
         self._initialize()
 
 
     @contextmanager
     def _conn(self):
         """
-        Helper to open a SQLite connection with row access by column name.
+        Yield the shared SQLite connection (row access by column name) inside a transaction.
+        Pragmas run once, when the connection is opened.
         """
-        con = sqlite3.connect(self.index_path)
-        con.execute("PRAGMA journal_mode=WAL;")
-        con.execute("PRAGMA foreign_keys=ON;")
-        con.execute("PRAGMA busy_timeout=5000;")
-        con.row_factory = sqlite3.Row
-        try:
-            yield con
-            con.commit()
-        except Exception:
-            con.rollback()
-            raise
-        finally:
-            con.close()
+        with self._lock:
+            if self._con is None:
+                con = sqlite3.connect(self.index_path, check_same_thread=False)
+                con.execute("PRAGMA journal_mode=WAL;")
+                con.execute("PRAGMA synchronous=NORMAL;") # safe under WAL; see GraphIndex._connect
+                con.execute("PRAGMA temp_store=MEMORY;")
+                con.execute("PRAGMA foreign_keys=ON;")
+                con.execute("PRAGMA busy_timeout=5000;")
+                con.row_factory = sqlite3.Row
+                self._con = con
+            con = self._con
+            try:
+                yield con
+                con.commit()
+            except Exception:
+                con.rollback()
+                raise
+
+
+    def close(self) -> None:
+        """Close the shared connection. It is reopened if used again."""
+        with self._lock:
+            if self._con is not None:
+                self._con.close()
+                self._con = None
 
 
     def _initialize(self) -> None:
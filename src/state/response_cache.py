@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+import hashlib
+import json
+import sqlite3
+import threading
+
+from ...config import log
+
+
+class ResponseCache:
+    """SQL cache of raw LLM responses, keyed by a hash of model + request params + system prompt + prompt"""
+
+    def __init__(self, index_path: str | Path):
+        self.index_path = Path(index_path)
+        # one long-lived connection, opened on first use and shared by every call;
+        # _lock serializes the calls so transactions don't interleave across threads
+        self._con: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+        self._initialize()
+
+
+    @contextmanager
+    def _conn(self):
+        """
+        Yield the shared SQLite connection (row access by column name) inside a transaction.
+        Pragmas run once, when the connection is opened.
+        """
+        with self._lock:
+            if self._con is None:
+                con = sqlite3.connect(self.index_path, check_same_thread=False)
+                con.execute("PRAGMA journal_mode=WAL;")
+                con.execute("PRAGMA synchronous=NORMAL;") # safe under WAL; see GraphIndex._connect
+                con.execute("PRAGMA temp_store=MEMORY;")
+                con.execute("PRAGMA busy_timeout=5000;")
+                con.row_factory = sqlite3.Row
+                self._con = con
+            con = self._con
+            try:
+                yield con
+                con.commit()
+            except Exception:
+                con.rollback()
+                raise
+
+
+    def close(self) -> None:
+        """Close the shared connection. It is reopened if used again."""
+        with self._lock:
+            if self._con is not None:
+                self._con.close()
+                self._con = None
+
+
+    def _initialize(self) -> None:
+        with self._conn() as con:
+            con.execute("""
+                CREATE TABLE IF NOT EXISTS response (
+                    key             TEXT PRIMARY KEY,
+                    model           TEXT,
+                    response        TEXT NOT NULL,
+                    date_added      TIMESTAMP DEFAULT NULL
+                )
+            """)
+
+
+    @staticmethod
+    def key(model: str, system: list[dict], prompt: str, params: Optional[dict] = None) -> str:
+        """
+        Hash everything that determines the response, so models/prompts never collide.
+        `params` holds the rest of the request (backend, endpoint, sampling settings);
+        anything new that is sent to the LLM has to go in there too.
+        """
+        h = hashlib.blake2b(digest_size=32)
+        for part in (
+            model or "",
+            json.dumps(params or {}, sort_keys=True, ensure_ascii=False),
+            json.dumps(system, sort_keys=True, ensure_ascii=False),
+            prompt,
+        ):
+            h.update(part.encode("utf-8"))
+            h.update(b"\0")
+        return h.hexdigest()
+
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for key, or None on a miss."""
+        with self._conn() as con:
+            row = con.execute(
+                "SELECT response FROM response WHERE key = ?",
+                (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        log.debug("Response cache hit: %s", key[:12])
+        return row["response"]
+
+
+    def put(self, key: str, model: str, response: str) -> None:
+        """Store (or overwrite) a response."""
+        with self._conn() as con:
+            con.execute("""
+                INSERT INTO response (key, model, response, date_added)
+                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(key) DO UPDATE SET
+                    response = excluded.response,
+                    date_added = excluded.date_added
+            """, (key, model, response))
+
+
+    def drop(self):
+        """drop all cached responses."""
+        with self._conn() as con:
+            con.execute("DELETE FROM response;")
@@ -3,6 +3,7 @@ nexus utilities
 """
 
 from pathlib import Path
+import time
 
 from ..config import log
 from ._schemas import (ChunkData)
@@ -65,7 +66,17 @@ def chunk(
         log.warning("Empty file: %s", filepath)
         return [], []
 
-    encoding = embedder.encode(text) # just tokenizing.
+    # just tokenizing. fast tokenizers also give each token's char span, so chunk text/offsets
+    # can be sliced straight from the source instead of decoded + estimated
+    offsets = None
+    encode_offsets = getattr(embedder, "encode_offsets", None)
+    if encode_offsets is not None:
+        try:
+            encoding, offsets = encode_offsets(text)
+        except NotImplementedError: # slow (python) tokenizer
+            offsets = None
+    if offsets is None:
+        encoding = embedder.encode(text)
     chunks_data, chunks_text = [], []
 
     # TODO: SENTENCIZER
@@ -88,15 +99,19 @@ def chunk(
         step = max_tokens - overlap
         for start in range(0, total_tokens, step):
             end = min(start + max_tokens, total_tokens)
-            token_slice = encoding[start:end]
-            chunk_text = embedder.decode(token_slice)
-            if not chunk_text:
+            if offsets is not None:
+                start_char, end_char = offsets[start][0], offsets[end - 1][1]
+                chunk_text = text[start_char:end_char]
+            else:
+                token_slice = encoding[start:end]
+                chunk_text = embedder.decode(token_slice)
+                start_char = int((start / total_tokens) * total_chars)
+                end_char = int((end / total_tokens) * total_chars)
+                start_char = max(0, min(start_char, total_chars))
+                end_char = max(start_char, min(end_char, total_chars))
+            if not chunk_text.strip():
                 log.warning("Empty chunk within %s: %s...", filepath, text[:30])
                 continue
-            start_char = int((start / total_tokens) * total_chars)
-            end_char = int((end / total_tokens) * total_chars)
-            start_char = max(0, min(start_char, total_chars))
-            end_char = max(start_char, min(end_char, total_chars))
             chunks_data.append(ChunkData(
                 document_id=document_id,
                 start_token=start,
@@ -116,8 +131,16 @@ def chunk(
 
 # --- progress bar ---
 
+_PROGRESS_INTERVAL = 0.1 # seconds between redraws
+_last_progress = 0.0
+
 def print_progress_bar(current: int, total: int, width: int = 50):
-    """Print a progress bar to stdout"""
+    """Print a progress bar to stdout (at most every 100ms, plus the first and last update)"""
+    global _last_progress
+    now = time.monotonic()
+    if 0 < current < total and now - _last_progress < _PROGRESS_INTERVAL:
+        return
+    _last_progress = now
     progress = current / total
     filled = int(width * progress)
     bar = '█' * filled + '░' * (width - filled)
@@ -125,6 +148,23 @@ def print_progress_bar(current: int, total: int, width: int = 50):
     print(f'\r[{bar}] {percent}% ({current}/{total})')
 
 
+# --- logging ---
+
+class Truncated:
+    """Log argument that cuts long text at `limit` chars, only when the record is actually formatted."""
+    __slots__ = ("text", "limit")
+
+    def __init__(self, text: str, limit: int = 4096):
+        self.text = text
+        self.limit = limit
+
+    def __str__(self) -> str:
+        text = str(self.text)
+        if len(text) <= self.limit:
+            return text
+        return f"{text[:self.limit]}... [{len(text) - self.limit} more chars]"
+
+
 # ---
 
 def pricing(words: str, input_price_per_M: float, output_price_per_M: float):
@@ -0,0 +1,189 @@
+from .common import TEST_LOG, GraphIndex
+from ..src.fastquery import FastQueryEngine
+from collections import defaultdict, deque
+import random
+import tempfile
+from pathlib import Path
+
+# Reference traversals are the original pure-Python ones over a name -> [(rel_id, nbr, strength, directed)]
+# adjacency (undirected relationships append their reverse); the engine's CSR / sign-bit / bit-lane
+# versions must give the same answers on a graph with more than 64 nodes.
+
+UNKNOWN = "Nowhere"
+ISOLATED = "Lone"
+
+
+def _fixture() -> tuple[GraphIndex, FastQueryEngine]:
+    rng = random.Random(7)
+    index = GraphIndex(Path(tempfile.mkdtemp()) / "graph_index.sqlite")
+    names = [f"N{i:02d}" for i in range(90)]
+    with index.bulk():
+        for name in names + [ISOLATED]:
+            index.upsert_entity(name, "TEST")
+        pairs = set()
+        while len(pairs) < 160:
+            src, tgt = rng.sample(names, 2)
+            if frozenset((src, tgt)) in pairs:
+                continue
+            pairs.add(frozenset((src, tgt)))
+            strength = rng.choice([0.0, 0.25, 0.5, 0.75, 1.0])
+            index.upsert_relationship(src, tgt, strength, directed=rng.random() < 0.4)
+        # zero-strength directed edges pack as -0.0; one more pair guarantees the case is covered
+        index.upsert_relationship("N00", "N89", 0.0, directed=True)
+        index.upsert_alias("N03", "Alias Three")
+        index.upsert_claim("N05 is an entity", "s0", entity_name="N05")
+    return index, FastQueryEngine(index)
+
+
+def _adjacency(index: GraphIndex) -> dict:
+    adj = defaultdict(list)
+    for r in index.iter_all_relationships():
+        strength = float(r["strength"]) if r["strength"] is not None else 0.0
+        directed = bool(r["directed"])
+        adj[r["source_name"]].append((r["relationship_id"], r["target_name"], strength, directed))
+        if not directed:
+            adj[r["target_name"]].append((r["relationship_id"], r["source_name"], strength, directed))
+    return adj
+
+
+def _ref_levels(adj: dict, start: str, depth: int) -> dict:
+    """depth -> [(neighbour, rel_id, strength, directed)], first edge to reach a node wins."""
+    levels = {}
+    visited = {start}
+    frontier = [start]
+    for d in range(1, depth + 1):
+        next_frontier = []
+        level_items = []
+        for src in frontier:
+            for (rel_id, nbr, strength, directed) in adj.get(src, []):
+                if nbr in visited:
+                    continue
+                visited.add(nbr)
+                next_frontier.append(nbr)
+                level_items.append((nbr, rel_id, strength, directed))
+        if not level_items:
+            break
+        levels[d] = level_items
+        frontier = next_frontier
+    return levels
+
+
+def _ref_shortest_path(adj: dict, src: str, tgt: str):
+    if src == tgt:
+        return []
+    q = deque([src])
+    parent = {src: (None, None)}
+    while q:
+        node = q.popleft()
+        for (rel_id, nbr, _, _) in adj.get(node, []):
+            if nbr not in parent:
+                parent[nbr] = (node, rel_id)
+                if nbr == tgt:
+                    path = []
+                    cur = tgt
+                    while cur != src:
+                        pnode, prel = parent[cur]
+                        path.append((pnode, cur, prel))
+                        cur = pnode
+                    return list(reversed(path))
+                q.append(nbr)
+    return None
+
+
+def _ref_dfs(adj: dict, start: str, max_depth: int) -> list:
+    out, seen = [], set()
+
+    def visit(node, d):
+        if node in seen or d > max_depth:
+            return
+        seen.add(node)
+        out.append(node)
+        for (_, nbr, _, _) in adj.get(node, []):
+            visit(nbr, d + 1)
+
+    visit(start, 0)
+    return out
+
+
+def test_neighbours_match_reference():
+    index, engine = _fixture()
+    adj = _adjacency(index)
+    for name in engine.node_name:
+        for depth in range(4):
+            result = engine.neighbours(name, depth)
+            assert result[0][0]["entity_name"] == name
+            assert list(result[0][0]["entity_claims"]) == engine.claims_for_entity.get(engine.entity_name_to_id[name], [])
+            got = {
+                d: [(item["entity_name"], item["relationship_id"], item["strength"], item["directed"]) for item in items]
+                for d, items in result.items() if d
+            }
+            assert got == _ref_levels(adj, name, depth), (name, depth)
+
+    # alias resolves to its entity; directed zero-strength edges keep their direction
+    assert engine.neighbours("Alias Three", 2) == engine.neighbours("N03", 2)
+    assert engine.neighbours(UNKNOWN) == []
+    assert dict(engine.neighbours(ISOLATED, 3)) == {0: engine.neighbours(ISOLATED)[0]}
+    hops = {item["entity_name"]: item for item in engine.neighbours("N00")[1]}
+    assert hops["N89"]["strength"] == 0.0 and hops["N89"]["directed"] is True
+    assert "N00" not in {item["entity_name"] for item in engine.neighbours("N89")[1]
+                         if item["relationship_id"] == hops["N89"]["relationship_id"]}
+    index.close()
+
+
+def test_multi_bfs_match_reference():
+    index, engine = _fixture()
+    adj = _adjacency(index)
+    # more sources than one 64-bit lane group, with unknowns, aliases and a repeat mixed in
+    sources = list(reversed(engine.node_name)) + ["Alias Three", UNKNOWN, "N10"]
+    assert len(sources) > 64
+    for depth in range(4):
+        result = engine.multi_bfs(sources, depth)
+        assert set(result) == set(sources)
+        for name in sources:
+            canonical = index.resolve_alias(name)
+            expected = {nbr for items in _ref_levels(adj, canonical, depth).values() for nbr, *_ in items}
+            assert result[name] == expected, (name, depth)
+    index.close()
+
+
+def test_shortest_path_match_reference():
+    index, engine = _fixture()
+    adj = _adjacency(index)
+    rels = {r["relationship_id"]: r for r in index.iter_all_relationships()}
+    names = engine.node_name[::7] + ["Alias Three", UNKNOWN]
+    for src in names:
+        for tgt in names:
+            path = engine.shortest_path(src, tgt)
+            expected = _ref_shortest_path(adj, index.resolve_alias(src), index.resolve_alias(tgt))
+            if expected is None:
+                assert path is None, (src, tgt)
+                continue
+            # equally short paths may differ; check length, endpoints and that every hop is a real edge
+            assert len(path) == len(expected), (src, tgt)
+            cur = index.resolve_alias(src)
+            for (a, b, rel_id) in path:
+                assert a == cur
+                assert (rel_id, b) in {(r, n) for (r, n, _, _) in adj[a]}
+                assert {a, b} == {rels[rel_id]["source_name"], rels[rel_id]["target_name"]}
+                cur = b
+            assert cur == index.resolve_alias(tgt)
+    index.close()
+
+
+def test_dfs_match_reference():
+    index, engine = _fixture()
+    adj = _adjacency(index)
+    for name in engine.node_name + ["Alias Three"]:
+        for depth in range(4):
+            assert engine.dfs(name, depth) == _ref_dfs(adj, index.resolve_alias(name), depth), (name, depth)
+    assert engine.dfs(UNKNOWN) == []
+    assert engine.dfs(ISOLATED, 3) == [ISOLATED]
+    index.close()
+
+
+if __name__ == "__main__":
+    test_neighbours_match_reference()
+    test_multi_bfs_match_reference()
+    test_shortest_path_match_reference()
+    test_dfs_match_reference()
+    TEST_LOG.info("FastQueryEngine traversals match the reference")
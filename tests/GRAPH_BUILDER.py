@@ -30,6 +30,55 @@ def test_process_llm_response():
     TEST_LOG.info("relationships: %s", relationships)
 
 
+def _llm_response(text: str) -> str:
+    return text.strip().format(
+        tuple_delimiter=GRAPH_CONFIG.tuple_delimiter, record_delimiter=GRAPH_CONFIG.record_delimiter, completion_delimiter=GRAPH_CONFIG.completion_delimiter
+    )
+
+
+def test_process_llm_response_edge_cases():
+    # completion delimiter and parentheses inside claims are kept
+    entities, relationships = GRAPH_BUILDER._process_llm_response(_llm_response("""
+    ("entity"{tuple_delimiter}Arcania{tuple_delimiter}GEO{tuple_delimiter}Costs {completion_delimiter} to visit (per day))
+    {record_delimiter}
+    ("relationship"{tuple_delimiter}Arcania{tuple_delimiter}Sankt Rúna{tuple_delimiter}Pays {completion_delimiter} (in cash))
+    {completion_delimiter}
+    """))
+    assert entities == [{
+        "entity_name": "Arcania", "entity_type": "GEO",
+        "entity_claim": f"Costs {GRAPH_CONFIG.completion_delimiter} to visit (per day)"
+    }]
+    assert relationships == [{
+        "source_name": "Arcania", "target_name": "Sankt Rúna",
+        "relationship_claim": f"Pays {GRAPH_CONFIG.completion_delimiter} (in cash)"
+    }]
+
+    # missing completion delimiter: the last record still counts
+    entities, _ = GRAPH_BUILDER._process_llm_response(_llm_response("""
+    ("entity"{tuple_delimiter}A{tuple_delimiter}GEO{tuple_delimiter}first)
+    {record_delimiter}
+    ("entity"{tuple_delimiter}B{tuple_delimiter}ORG{tuple_delimiter}last)
+    """))
+    assert [e["entity_name"] for e in entities] == ["A", "B"]
+
+    # malformed records are skipped, the rest are kept
+    entities, relationships = GRAPH_BUILDER._process_llm_response(_llm_response("""
+    ("entity"{tuple_delimiter}A{tuple_delimiter}GEO)
+    {record_delimiter}
+    ("relationship"{tuple_delimiter}A{tuple_delimiter}B{tuple_delimiter}x{tuple_delimiter}y)
+    {record_delimiter}
+    ("entity"{tuple_delimiter}C{tuple_delimiter}ORG{tuple_delimiter}kept)
+    {completion_delimiter}
+    """))
+    assert [e["entity_name"] for e in entities] == ["C"]
+    assert relationships == []
+
+    # nothing to parse
+    assert GRAPH_BUILDER._process_llm_response("") == ([], [])
+    assert GRAPH_BUILDER._process_llm_response("no records here") == ([], [])
+    assert GRAPH_BUILDER._process_llm_response(None) == ([], [])
+
+
 def test_progress_bar():
     from ..src.util import print_progress_bar
     import time
@@ -0,0 +1,377 @@
+from .common import TEST_LOG, GraphIndex
+from ..src.state.graph_index import _ALIAS_CACHE_RECHECK, _SQL_CREATE_CLAIMS
+from ..src._schemas import (
+    RelationshipRecord,
+    RelationshipCollisionError,
+    RelationshipMergeConflict,
+    DeletionConflict,
+    EntityNotFoundError
+)
+from datetime import datetime, timezone
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+
+def _fresh_index() -> tuple[GraphIndex, Path]:
+    path = Path(tempfile.mkdtemp()) / "graph_index.sqlite"
+    return GraphIndex(path), path
+
+
+def test_alias_round_trip():
+    index, _ = _fresh_index()
+    index.upsert_entity("Republic of Arcania", "GEO")
+    index.upsert_alias("Republic of Arcania", "Arcania")
+    assert index.resolve_alias("Arcania") == "Republic of Arcania"
+    assert index.resolve_alias("Republic of Arcania") == "Republic of Arcania"
+    assert index.load_aliases("Republic of Arcania") == ["Arcania"]
+
+    index.delete_alias("Republic of Arcania", "Arcania")
+    assert index.resolve_alias("Arcania") == "Arcania"
+    assert index.load_aliases("Republic of Arcania") == []
+    index.close()
+
+
+def test_alias_written_by_another_instance():
+    index, path = _fresh_index()
+    index.upsert_entity("Republic of Arcania")
+    index.upsert_entity("Sankt Rúna")
+    assert index.resolve_alias("Arcania") == "Arcania" # now in the shared cache
+
+    other = GraphIndex(path)
+    other.upsert_alias("Republic of Arcania", "Arcania")
+    time.sleep(_ALIAS_CACHE_RECHECK) # other connections' commits are noticed within this
+    assert index.resolve_alias("Arcania") == "Republic of Arcania"
+    other.delete_alias("Republic of Arcania", "Arcania")
+    other.upsert_alias("Sankt Rúna", "Arcania")
+    time.sleep(_ALIAS_CACHE_RECHECK)
+    assert index.resolve_alias("Arcania") == "Sankt Rúna"
+    other.close()
+    index.close()
+
+
+def test_reconnect_after_close():
+    index, path = _fresh_index()
+    index.upsert_entity("Republic of Arcania", "GEO")
+    index.upsert_alias("Republic of Arcania", "Arcania")
+    index.close()
+    # the writer and the pooled readers reopen on the next call
+    assert index.resolve_alias("Arcania") == "Republic of Arcania"
+    index.upsert_entity("Sankt Rúna")
+    assert sorted(GraphIndex(path).list_all_entities()) == ["Republic of Arcania", "Sankt Rúna"]
+    index.close()
+
+
+def test_claim_round_trip():
+    index, _ = _fresh_index()
+    index.upsert_claim("offset", "s0", entity_name="Arcania", claim_date="2021-03-04T10:00:00+05:00")
+    index.upsert_claim("compact", "s1", entity_name="Arcania", claim_date="20210101")
+    index.upsert_claim("plain", "s2", entity_name="Arcania", claim_date="2021-02-01")
+    claims = index.load_entity_claims("Arcania")
+    TEST_LOG.info("claims: %s", claims)
+    # wall-clock time is kept as written, newest claim_date first
+    assert [(c.content, c.claim_date) for c in claims] == [
+        ("offset", "2021-03-04 10:00:00"),
+        ("plain", "2021-02-01 00:00:00"),
+        ("compact", "2021-01-01 00:00:00"),
+    ]
+    index.close()
+
+
+def test_claim_date_fallback():
+    index, _ = _fresh_index()
+    before = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+    index.upsert_claim("year only", "s0", entity_name="Arcania", claim_date="2021")
+    index.upsert_claim("undated", "s1", entity_name="Arcania")
+    index.upsert_claims([
+        dict(content="batch undated", source="s2", entity_name="Arcania"),
+        dict(content="batch junk", source="s2", entity_name="Arcania", claim_date="last spring"),
+    ])
+    after = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+    claims = index.load_entity_claims("Arcania")
+    assert len(claims) == 4
+    for claim in claims:
+        assert before <= claim.claim_date <= after, claim
+    index.close()
+
+
+
+def test_upsert_relationships_matches_single_upserts():
+    records = [
+        RelationshipRecord("Arcania", "Sankt Rúna", 0.5),
+        RelationshipRecord("Ministry", "Arcania", 0.2, directed=True),
+        RelationshipRecord("Sankt Rúna", "Arcania", 0.7), # same undirected pair, later strength wins
+        RelationshipRecord("Arcania", "Ministry", 0.9, directed=True), # opposite direction, own row
+        RelationshipRecord("Rúna", "Ministry", 0.4), # alias endpoint
+    ]
+    single, _ = _fresh_index()
+    bulk, _ = _fresh_index()
+    for index in (single, bulk):
+        index.upsert_entity("Sankt Rúna", "GEO")
+        index.upsert_alias("Sankt Rúna", "Rúna")
+
+    expected = [single.upsert_relationship(r.source_name, r.target_name, r.strength, r.directed) for r in records]
+    ids = bulk.upsert_relationships(records)
+    assert ids == expected
+    assert ids[0] == ids[2] and ids[1] != ids[3]
+    assert list(bulk.dump_all_relationships()) == list(single.dump_all_relationships())
+    strengths = {r["relationship_id"]: r["strength"] for r in bulk.dump_all_relationships()}
+    assert strengths[ids[0]] == 0.7 and strengths[ids[4]] == 0.4
+    assert sorted(bulk.list_all_entities()) == ["Arcania", "Ministry", "Sankt Rúna"]
+    assert bulk.upsert_relationships([]) == []
+
+    # a self-relationship (here through the alias) rejects the whole batch
+    before = list(bulk.dump_all_relationships())
+    try:
+        bulk.upsert_relationships([RelationshipRecord("Arcania", "Capital", 1.0), RelationshipRecord("Sankt Rúna", "Rúna")])
+        assert False, "expected RelationshipCollisionError"
+    except RelationshipCollisionError:
+        pass
+    assert list(bulk.dump_all_relationships()) == before
+    assert not bulk.entity_exists("Capital")
+    single.close()
+    bulk.close()
+
+
+def test_upsert_claims_keeps_record_order():
+    index, _ = _fresh_index()
+    names = ["Arcania", "Sankt Rúna", "Arcania", "Ministry", "Arcania"]
+    index.upsert_claims(
+        dict(content=f"claim {i}", source="s0", entity_name=name, entity_type=etype, claim_date="2021-01-01")
+        for i, (name, etype) in enumerate(zip(names, ["GEO", "GEO", None, "ORG", None]))
+    )
+    assert [c.content for c in index.load_entity_claims("Arcania")] == ["claim 0", "claim 2", "claim 4"]
+    assert sorted(index.list_all_entities()) == ["Arcania", "Ministry", "Sankt Rúna"]
+    assert dict((name, etype) for name, etype, _ in index.list_entities_with_meta())["Arcania"] == "GEO"
+    index.close()
+
+
+
+def _claims_by_content(index: GraphIndex) -> dict:
+    return {c["content"]: (c["entity_id"], c["relationship_id"]) for c in index.dump_all_claims()}
+
+
+def test_merge_alias_moves_relationships_and_claims():
+    index, _ = _fresh_index()
+    port = index.upsert_entity("Port")
+    canonical = index.upsert_entity("Republic of Arcania", "GEO")
+    index.upsert_entity("Arcania")
+    kept = index.upsert_relationship("Republic of Arcania", "Ministry", 0.9)
+    collides = index.upsert_relationship("Ministry", "Arcania", 0.3)
+    moved = index.upsert_relationship("Arcania", "Sankt Rúna", 0.6, directed=True)
+    flipped = index.upsert_relationship("Arcania", "Port", 0.2) # undirected: lower entity id stays first
+    index.upsert_claim("alias entity claim", "s0", entity_name="Arcania")
+    index.upsert_claim("colliding rel claim", "s0", relationship=RelationshipRecord("Arcania", "Ministry"))
+    index.upsert_claim("moved rel claim", "s0", relationship=RelationshipRecord("Arcania", "Sankt Rúna", directed=True))
+    index.upsert_alias("Republic of Arcania", "Arcania")
+
+    index.merge_alias("Republic of Arcania", "Arcania")
+    assert not index.entity_exists("Arcania")
+    assert index.resolve_alias("Arcania") == "Republic of Arcania"
+    rels = {r["relationship_id"]: r for r in index.dump_all_relationships()}
+    assert collides not in rels
+    assert rels[kept]["strength"] == 0.9 # canonical's strength wins a collision
+    assert (rels[moved]["source_name"], rels[moved]["target_name"], rels[moved]["directed"]) == \
+        ("Republic of Arcania", "Sankt Rúna", 1)
+    assert (rels[flipped]["source_name"], rels[flipped]["target_name"]) == ("Port", "Republic of Arcania")
+    assert port < canonical
+    claims = _claims_by_content(index)
+    assert claims["alias entity claim"] == (canonical, None)
+    assert claims["colliding rel claim"] == (None, kept)
+    assert claims["moved rel claim"] == (None, moved)
+    index.close()
+
+
+def _self_looping_alias(index: GraphIndex, canonical: str, alias: str) -> int:
+    """An alias entity related to its own canonical; upsert_* refuse this, older graphs may have it."""
+    index.upsert_entity(canonical)
+    index.upsert_entity(alias)
+    index.upsert_alias(canonical, alias)
+    with index._write() as con:
+        return con.execute("""
+            INSERT INTO relationships (source_id, target_id, strength, directed, date_added)
+            SELECT a.id, c.id, 0.5, 1, CURRENT_TIMESTAMP FROM entities a, entities c
+            WHERE a.name = ? AND c.name = ? RETURNING id;
+        """, (alias, canonical)).fetchone()[0]
+
+
+def test_merge_alias_self_loop_guard():
+    index, _ = _fresh_index()
+    loop = _self_looping_alias(index, "Republic of Arcania", "Arcania")
+    index.upsert_relationship("Arcania", "Ministry", 0.4)
+    before = list(index.dump_all_relationships())
+    for _ in range(2): # the temp table is dropped on failure, so a retry fails the same way
+        try:
+            index.merge_alias("Republic of Arcania", "Arcania")
+            assert False, "expected RelationshipMergeConflict"
+        except RelationshipMergeConflict:
+            pass
+    assert index.entity_exists("Arcania")
+    assert list(index.dump_all_relationships()) == before
+    assert loop in {r["relationship_id"] for r in before}
+    index.close()
+
+
+def test_merge_all_aliases_strategies():
+    def build():
+        index, _ = _fresh_index()
+        _self_looping_alias(index, "Republic of Arcania", "Arcania")
+        index.upsert_entity("RoA")
+        index.upsert_relationship("RoA", "Ministry", 0.4)
+        index.upsert_alias("Republic of Arcania", "RoA")
+        return index
+
+    index = build()
+    try:
+        index.merge_all_aliases("Republic of Arcania")
+        assert False, "expected RelationshipMergeConflict"
+    except RelationshipMergeConflict:
+        pass
+    assert index.entity_exists("Arcania") and index.entity_exists("RoA") # whole batch rolled back
+    index.close()
+
+    index = build()
+    result = index.merge_all_aliases("Republic of Arcania", strategy="skip_on_conflict")
+    assert result["merged"] == ["RoA"]
+    assert [alias for alias, _ in result["skipped"]] == ["Arcania"]
+    assert index.entity_exists("Arcania") and not index.entity_exists("RoA")
+    assert [(r["source_name"], r["target_name"]) for r in index.dump_all_relationships()
+            if "Ministry" in (r["source_name"], r["target_name"])] == [("Republic of Arcania", "Ministry")]
+    index.close()
+
+
+
+def test_delete_entity_cascade():
+    index, _ = _fresh_index()
+    index.upsert_entity("Republic of Arcania")
+    index.upsert_entity("Arcania")
+    kept = index.upsert_relationship("Arcania", "Sankt Rúna", 0.6) # alias-entity's own relationship
+    index.upsert_alias("Republic of Arcania", "Arcania")
+    index.upsert_relationship("Republic of Arcania", "Ministry", 0.9)
+    other = index.upsert_relationship("Ministry", "Sankt Rúna", 0.1)
+    index.upsert_claim("entity claim", "s0", entity_name="Republic of Arcania")
+    index.upsert_claim("rel claim", "s0", relationship=RelationshipRecord("Republic of Arcania", "Ministry"))
+    index.upsert_claim("other rel claim", "s0", relationship=RelationshipRecord("Ministry", "Sankt Rúna"))
+
+    for name, exc in (("Arcania", DeletionConflict), ("Nowhere", EntityNotFoundError)):
+        try:
+            index.delete_entity(name)
+            assert False, f"expected {exc.__name__}"
+        except exc:
+            pass
+
+    index.delete_entity("Republic of Arcania")
+    assert not index.entity_exists("Republic of Arcania")
+    assert index.entity_exists("Arcania") and index.resolve_alias("Arcania") == "Arcania"
+    assert sorted(r["relationship_id"] for r in index.dump_all_relationships()) == sorted([kept, other])
+    assert [c["content"] for c in index.dump_all_claims()] == ["other rel claim"]
+    index.close()
+
+
+def test_delete_entity_without_cascade():
+    index, _ = _fresh_index()
+    index.upsert_entity("Republic of Arcania")
+    index.upsert_entity("Arcania")
+    index.upsert_relationship("Arcania", "Ministry", 0.6) # blocks through the alias-entity
+    index.upsert_alias("Republic of Arcania", "Arcania")
+    index.upsert_claim("entity claim", "s0", entity_name="Sankt Rúna")
+
+    for name in ("Republic of Arcania", "Sankt Rúna"):
+        try:
+            index.delete_entity(name, cascade=False)
+            assert False, "expected DeletionConflict"
+        except DeletionConflict:
+            pass
+    assert index.entity_exists("Republic of Arcania") and index.entity_exists("Sankt Rúna")
+
+    index.upsert_entity("Port")
+    index.delete_entity("Port", cascade=False)
+    assert not index.entity_exists("Port")
+    index.close()
+
+
+
+def test_claims_cascade_migration():
+    index, path = _fresh_index()
+    index.upsert_relationship("Republic of Arcania", "Ministry", 0.9)
+    index.upsert_claim("entity claim", "s0", entity_name="Republic of Arcania", claim_date="2021-01-01")
+    index.upsert_claim("rel claim", "s0", relationship=RelationshipRecord("Republic of Arcania", "Ministry"))
+    index.upsert_claim("untouched", "s0", entity_name="Ministry")
+    claims = list(index.dump_all_claims())
+    index.close()
+
+    # rebuild claims the way older versions created it, without ON DELETE CASCADE
+    con = sqlite3.connect(path)
+    con.executescript(f"""
+        {_SQL_CREATE_CLAIMS.format(table="claims_old").replace(" ON DELETE CASCADE", "")}
+        INSERT INTO claims_old SELECT * FROM claims;
+        DROP TABLE claims;
+        ALTER TABLE claims_old RENAME TO claims;
+    """)
+    assert {row[6] for row in con.execute("PRAGMA foreign_key_list(claims);")} == {"NO ACTION"}
+    con.close()
+
+    index = GraphIndex(path)
+    with index._read() as con:
+        assert {row[6] for row in con.execute("PRAGMA foreign_key_list(claims);")} == {"CASCADE"}
+        assert con.execute("SELECT name FROM sqlite_master WHERE tbl_name = 'claims' AND type = 'index';").fetchall()
+    assert list(index.dump_all_claims()) == claims
+    assert index.load_entity_claims("Republic of Arcania")[0].claim_date == "2021-01-01 00:00:00"
+
+    index.delete_entity("Republic of Arcania")
+    assert [c["content"] for c in index.dump_all_claims()] == ["untouched"]
+    index.close()
+
+
+
+def test_load_relationships_dedupe():
+    index, _ = _fresh_index()
+    index.upsert_relationship("Republic of Arcania", "Ministry", 0.9)
+    index.upsert_relationship("Ministry", "Republic of Arcania", 0.3, directed=True)
+    index.upsert_relationship("Arcania", "Sankt Rúna", 0.6, directed=True) # alias-entity's own relationship
+    index.upsert_alias("Republic of Arcania", "Arcania")
+    index.upsert_entity("Port")
+    # an undirected row stored un-normalized (target, source), as older versions could leave behind;
+    # it shares the (min, max, 0) key with the normalized row, and the lower id wins
+    with index._write() as con:
+        con.execute("""
+            INSERT INTO relationships (source_id, target_id, strength, directed, date_added)
+            SELECT m.id, c.id, 0.1, 0, CURRENT_TIMESTAMP FROM entities m, entities c
+            WHERE m.name = 'Ministry' AND c.name = 'Republic of Arcania';
+        """)
+
+    # rows touching the canonical first, then directed before undirected, then by id
+    expected = [
+        RelationshipRecord("Ministry", "Republic of Arcania", 0.3, True),
+        RelationshipRecord("Republic of Arcania", "Ministry", 0.9, False),
+        RelationshipRecord("Arcania", "Sankt Rúna", 0.6, True),
+    ]
+    assert index.load_relationships("Republic of Arcania") == expected
+    assert index.load_relationships("Arcania") == expected
+    assert index.load_relationships("Republic of Arcania", directed=False) == [expected[1]]
+    assert index.load_relationships("Republic of Arcania", min_strength=0.5) == expected[1:]
+    assert index.load_relationships("Port") == []
+    try:
+        index.load_relationships("Nowhere")
+        assert False, "expected EntityNotFoundError"
+    except EntityNotFoundError:
+        pass
+    index.close()
+
+
+if __name__ == "__main__":
+    test_alias_round_trip()
+    test_alias_written_by_another_instance()
+    test_reconnect_after_close()
+    test_claim_round_trip()
+    test_claim_date_fallback()
+    test_upsert_relationships_matches_single_upserts()
+    test_upsert_claims_keeps_record_order()
+    test_merge_alias_moves_relationships_and_claims()
+    test_merge_alias_self_loop_guard()
+    test_merge_all_aliases_strategies()
+    test_delete_entity_cascade()
+    test_delete_entity_without_cascade()
+    test_claims_cascade_migration()
+    test_load_relationships_dedupe()
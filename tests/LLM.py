@@ -1,5 +1,7 @@
 from .common import TEST_LOG,  LLM_CONFIG
 from ..src.llm import SyncLLM, AsyncLLM
+from types import SimpleNamespace
+import asyncio
 
 def test_openai():
     return
@@ -10,15 +12,58 @@ def test_local():
 def test_openrouter():
     return
 
-def test_error_retry():
-    _api_key = LLM_CONFIG.api_key
-    _model = LLM_CONFIG.sync_model
-    llm = SyncLLM(backend="openai", model=_model, api_key=_api_key, url="null", retries=3)
+class _FlakyCompletions:
+    """Stands in for client.chat.completions: fails `failures` times, then answers."""
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.calls = 0
+
+    def _answer(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise ConnectionError(f"attempt {self.calls} failed")
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=" ok "))])
+
+    def create(self, **kwargs):
+        return self._answer()
+
+
+class _AsyncFlakyCompletions(_FlakyCompletions):
+    async def create(self, **kwargs):
+        return self._answer()
+
+
+def _with_completions(llm, completions):
+    llm.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
     llm.set_system("You are a helpful assistant.")
-    msg = llm.run("Hello")
-    print(msg)
-    return
+    return llm
+
+
+def test_error_retry():
+    # retries counts extra attempts: retries=1 means one retry after the first failure
+    completions = _FlakyCompletions(failures=1)
+    llm = _with_completions(SyncLLM(backend="local", model=LLM_CONFIG.sync_model, api_key=None, url="http://localhost:1/v1", retries=1), completions)
+    assert llm.run("Hello") == "ok"
+    assert completions.calls == 2
+
+    completions = _FlakyCompletions(failures=1)
+    llm = _with_completions(SyncLLM(backend="local", model=LLM_CONFIG.sync_model, api_key=None, url="http://localhost:1/v1", retries=0), completions)
+    try:
+        llm.run("Hello")
+        raise AssertionError("expected the first failure to be raised")
+    except ConnectionError:
+        pass
+    assert completions.calls == 1
+    TEST_LOG.info("sync retries ok")
+
 
+def test_error_retry_async():
+    completions = _AsyncFlakyCompletions(failures=1)
+    llm = _with_completions(AsyncLLM(backend="local", model=LLM_CONFIG.async_model, api_key=None, url="http://localhost:1/v1", retries=1), completions)
+    assert asyncio.run(llm.run("Hello")) == "ok"
+    assert completions.calls == 2
+    TEST_LOG.info("async retries ok")
 
 if __name__ == "__main__":
-    test_error_retry()
\ No newline at end of file
+    test_error_retry()
+    test_error_retry_async()
@@ -7,9 +7,9 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, List, Optional
 
-import sqlite3
 from fastapi import FastAPI, HTTPException, Query, Request
-from fastapi.responses import FileResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import FileResponse, Response
 from pydantic import BaseModel
 
 try:
@@ -89,8 +89,12 @@ app = FastAPI(
     version="0.1.0",
     description="Read-only graph viewer backed by GraphIndex.",
 )
+# snapshots are large and repetitive (node ids show up in nodes, edges and adjacency)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 app.state.graph_index = None
 app.state.graph_index_path = None
+app.state.snapshot_json = None # serialized GraphSnapshot (bytes), see get_graph_snapshot()
+app.state.snapshot_version = None
 
 
 def _resolve_index_path() -> Path:
@@ -121,72 +125,75 @@ def _get_graph_index(request: Request) -> GraphIndex:
     return index
 
 
-def _fetch_entity_types(index_path: Path) -> Dict[str, Optional[str]]:
-    query = "SELECT name, entity_type FROM entities"
-    results: Dict[str, Optional[str]] = {}
-    with sqlite3.connect(f"file:{index_path}?mode=ro", uri=True) as conn:
-        conn.row_factory = sqlite3.Row
-        for row in conn.execute(query):
-            results[row["name"]] = row["entity_type"]
-    return results
-
-
-def _build_graph_snapshot(index: GraphIndex, index_path: Path) -> GraphSnapshot:
-    entities = index.list_all_entities()
-    entity_types = _fetch_entity_types(index_path)
-
-    canonicals = set()
-    for name in entities:
-        resolved = index.resolve_alias(name)
-        canonicals.add(resolved)
-    
-    filtered_entities = [name for name in entities if index.resolve_alias(name) == name]
-
-    nodes: List[GraphNode] = []
-    adjacency: Dict[str, set[str]] = {name: set() for name in filtered_entities}
-    seen_edges: Dict[tuple[str, str], GraphEdge] = {}
-
-    for name in filtered_entities:
+def _index_version(index_path: Path) -> tuple:
+    # under WAL, commits land in the -wal file and only reach the main file on checkpoint,
+    # so look at both
+    version = []
+    for path in (index_path, index_path.with_name(index_path.name + "-wal")):
         try:
-            claims = index.load_entity_claims(name)
-        except EntityNotFoundError:
-            claims = []
-        claim_count = len(claims)
-
-        node = GraphNode(
+            stat = path.stat()
+        except FileNotFoundError:
+            version.append(None)
+        else:
+            version.append((stat.st_mtime_ns, stat.st_size))
+    return tuple(version)
+
+
+def _build_graph_snapshot(index: GraphIndex) -> GraphSnapshot:
+    # everything comes from a few bulk reads, taken from one consistent view of the index;
+    # the loops below don't touch the db
+    with index.snapshot():
+        filtered_entities = index.list_canonical_entities()
+        alias_of = index.dump_alias_map()
+        entity_rows = index.list_entities_with_meta()
+        relationships = index.dump_all_relationships()
+
+    def resolve(name: str) -> str:
+        return alias_of.get(name, name)
+
+    # claims of alias entities count towards their canonical, same as load_entity_claims()
+    entity_types: Dict[str, Optional[str]] = {}
+    claim_counts: Dict[str, int] = {}
+    for name, entity_type, count in entity_rows:
+        entity_types[name] = entity_type
+        canonical = resolve(name)
+        claim_counts[canonical] = claim_counts.get(canonical, 0) + count
+
+    nodes: List[GraphNode] = [
+        GraphNode(
             id=name,
             label=name,
             entity_type=entity_types.get(name),
-            claim_count=claim_count,
+            claim_count=claim_counts.get(name, 0),
         )
-        nodes.append(node)
+        for name in filtered_entities
+    ]
+    adjacency: Dict[str, set[str]] = {name: set() for name in filtered_entities}
+    seen_edges: Dict[tuple[str, str], GraphEdge] = {}
 
-        try:
-            relationships = index.load_relationships(name, directed=None)
-        except EntityNotFoundError:
-            relationships = []
-
-        for rel in relationships:
-            src = index.resolve_alias(rel.source_name)
-            tgt = index.resolve_alias(rel.target_name)
-            if src == tgt:
-                continue
-            a, b = sorted([src, tgt])
-            key = (a, b)
-            adjacency.setdefault(a, set()).add(b)
-            adjacency.setdefault(b, set()).add(a)
-            if key in seen_edges:
-                continue
-
-            edge = GraphEdge(
-                id=f"{a}||{b}",
-                source=a,
-                target=b,
-                strength=rel.strength if rel.strength is not None else None,
-            )
-            seen_edges[key] = edge
-
-    sorted_nodes = sorted(nodes, key=lambda n: n.id.lower())
+    for rel in relationships:
+        src = resolve(rel["source_name"])
+        tgt = resolve(rel["target_name"])
+        if src == tgt:
+            continue
+        a, b = sorted([src, tgt])
+        key = (a, b)
+        adjacency.setdefault(a, set()).add(b)
+        adjacency.setdefault(b, set()).add(a)
+        if key in seen_edges:
+            continue
+
+        edge = GraphEdge(
+            id=f"{a}||{b}",
+            source=a,
+            target=b,
+            strength=rel["strength"],
+        )
+        seen_edges[key] = edge
+
+    # nodes already come in name order (list_canonical_entities sorts them); edges and
+    # adjacency are keyed on alias-resolved, deduped names, so they're sorted here
+    sorted_nodes = nodes
     sorted_edges = sorted(seen_edges.values(), key=lambda e: (e.source.lower(), e.target.lower()))
     adjacency_lists = {
         node: sorted(neighbors, key=str.lower) for node, neighbors in adjacency.items()
@@ -204,13 +211,6 @@ def _build_graph_snapshot(index: GraphIndex, index_path: Path) -> GraphSnapshot:
     )
 
 
-def _sort_claims(claims: List[Claim]) -> List[Claim]:
-    dated = [claim for claim in claims if claim.claim_date]
-    undated = [claim for claim in claims if not claim.claim_date]
-    dated.sort(key=lambda c: c.claim_date, reverse=True)
-    return dated + undated
-
-
 @app.on_event("startup")
 def startup_event() -> None:
     index_path = _resolve_index_path()
@@ -253,10 +253,16 @@ def serve_favicon() -> FileResponse:
 
 
 @app.get("/api/graph/snapshot", response_model=GraphSnapshot)
-def get_graph_snapshot(request: Request) -> GraphSnapshot:
+def get_graph_snapshot(request: Request) -> Response:
     index = _get_graph_index(request)
     index_path: Path = request.app.state.graph_index_path
-    return _build_graph_snapshot(index, index_path)
+    state = request.app.state
+    # the viewer is read-only and the graph rarely changes, so rebuild only when the file does
+    version = _index_version(index_path)
+    if state.snapshot_json is None or state.snapshot_version != version:
+        state.snapshot_json = _build_graph_snapshot(index).model_dump_json().encode()
+        state.snapshot_version = version
+    return Response(content=state.snapshot_json, media_type="application/json")
 
 
 @app.get("/api/entity/{name}", response_model=EntityResponse)
@@ -272,7 +278,6 @@ def get_entity(name: str, request: Request) -> EntityResponse:
         Claim(content=record.content, source=record.source, date_added=record.date_added, claim_date=record.claim_date)
         for record in claims_data
     ]
-    claims = _sort_claims(claims)
     aliases = sorted(index.load_aliases(canonical))
 
     try:
@@ -339,7 +344,6 @@ def get_edge(
         Claim(content=record.content, source=record.source, date_added=record.date_added, claim_date=record.claim_date)
         for record in claims_data
     ]
-    claims = _sort_claims(claims)
 
     return EdgeResponse(source=canonical_src, target=canonical_tgt, claims=claims)
 